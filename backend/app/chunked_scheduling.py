@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytz
+from app.local_planner import TIME_FORMAT, parse_hours, plan_locally
+
+# Share of a day's free time that tasks may fill, the rest is left for breaks
+USABLE_FREE_TIME = 0.8
+
+
+def parse_schedule_time(value, timezone):
+    """
+    Parse a datetime from the model (ISO 8601, with or without offset) or a
+    free-time string into a naive local datetime.
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(pytz.timezone(timezone)).replace(tzinfo=None)
+    return parsed
+
+
+def split_free_times_by_day(free_times):
+    """
+    Split free time blocks at midnight and group them by date.
+
+    Returns:
+        dict: YYYY-MM-DD -> list of {"start", "end"} blocks, in order.
+    """
+    by_day = {}
+    for block in free_times:
+        start = datetime.strptime(block["start"], TIME_FORMAT)
+        end = datetime.strptime(block["end"], TIME_FORMAT)
+        while start < end:
+            midnight = (start + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+            piece_end = min(end, midnight)
+            by_day.setdefault(start.date().isoformat(), []).append({
+                "start": start.strftime(TIME_FORMAT),
+                "end": piece_end.strftime(TIME_FORMAT),
+            })
+            start = piece_end
+    return by_day
+
+
+def free_hours(blocks):
+    return sum(
+        (datetime.strptime(b["end"], TIME_FORMAT) - datetime.strptime(b["start"], TIME_FORMAT)).total_seconds()
+        for b in blocks
+    ) / 3600
+
+
+def plan_chunks(gpt_input, max_tasks_per_chunk):
+    """
+    Cheap first pass: assign each task to a day by deadline and remaining free
+    capacity, then group consecutive days into chunks of at most
+    `max_tasks_per_chunk` tasks.
+
+    Tasks are taken in the given (prioritized) order and placed on the earliest
+    day, not after their due date, with enough capacity left. Tasks that fit
+    nowhere before their deadline go to the earliest day with capacity, or to
+    the last day.
+
+    Returns:
+        list: Chunks as {"days": [...], "tasks": [...], "free_times": [...]}.
+    """
+    free_by_day = split_free_times_by_day(gpt_input["free_times"])
+    days = sorted(free_by_day)
+    if not days:
+        return []
+    capacity = {day: free_hours(free_by_day[day]) * USABLE_FREE_TIME for day in days}
+    tasks_by_day = {day: [] for day in days}
+
+    for task in gpt_input["tasks"]:
+        hours = parse_hours(task.get("estimated_time_hours"))
+        due_day = (task.get("due_date") or "")[:10] or days[-1]
+        candidates = [day for day in days if day <= due_day and capacity[day] >= hours]
+        if not candidates:
+            candidates = [day for day in days if capacity[day] >= hours] or [days[-1]]
+        day = candidates[0]
+        capacity[day] -= hours
+        tasks_by_day[day].append(task)
+
+    chunks = []
+    current = {"days": [], "tasks": [], "free_times": []}
+    for day in days:
+        if current["tasks"] and len(current["tasks"]) + len(tasks_by_day[day]) > max_tasks_per_chunk:
+            chunks.append(current)
+            current = {"days": [], "tasks": [], "free_times": []}
+        current["days"].append(day)
+        current["tasks"].extend(tasks_by_day[day])
+        current["free_times"].extend(free_by_day[day])
+    if current["tasks"]:
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk["tasks"]]
+
+
+def build_chunk_input(gpt_input, chunk):
+    """
+    Scheduling input restricted to a chunk's tasks and days.
+    """
+    first_day, last_day = chunk["days"][0], chunk["days"][-1]
+    return {
+        "tasks": chunk["tasks"],
+        "free_times": chunk["free_times"],
+        "busy_times": [
+            busy for busy in gpt_input["busy_times"]
+            if busy["end"][:10] >= first_day and busy["start"][:10] <= last_day
+        ],
+        "context": {**gpt_input["context"], "start_date": first_day, "end_date": last_day},
+    }
+
+
+def find_conflicts(scheduled_tasks, free_times, timezone):
+    """
+    Scheduled entries that overlap an earlier entry, fall outside every free
+    time block, or have an unreadable/empty time range.
+
+    Returns:
+        list: The conflicting entries, in input order.
+    """
+    blocks = [
+        (datetime.strptime(b["start"], TIME_FORMAT), datetime.strptime(b["end"], TIME_FORMAT))
+        for b in free_times
+    ]
+    accepted = []
+    conflicts = []
+    seen_tasks = set()
+    for entry in scheduled_tasks:
+        try:
+            start = parse_schedule_time(entry["start_time"], timezone)
+            end = parse_schedule_time(entry["end_time"], timezone)
+        except (KeyError, TypeError, ValueError):
+            conflicts.append(entry)
+            continue
+
+        in_free_time = any(block_start <= start and end <= block_end for block_start, block_end in blocks)
+        overlaps = any(start < other_end and end > other_start for other_start, other_end in accepted)
+        if end <= start or not in_free_time or overlaps or entry.get("task_id") in seen_tasks:
+            conflicts.append(entry)
+            continue
+        accepted.append((start, end))
+        seen_tasks.add(entry.get("task_id"))
+    return conflicts
+
+
+def subtract_scheduled(free_times, scheduled_tasks, timezone):
+    """
+    Free time blocks left after removing the time taken by scheduled entries.
+    """
+    taken = sorted(
+        (parse_schedule_time(e["start_time"], timezone), parse_schedule_time(e["end_time"], timezone))
+        for e in scheduled_tasks
+    )
+    remaining = []
+    for block in free_times:
+        start = datetime.strptime(block["start"], TIME_FORMAT)
+        end = datetime.strptime(block["end"], TIME_FORMAT)
+        for taken_start, taken_end in taken:
+            if taken_end <= start or taken_start >= end:
+                continue
+            if taken_start > start:
+                remaining.append({"start": start.strftime(TIME_FORMAT), "end": taken_start.strftime(TIME_FORMAT)})
+            start = max(start, taken_end)
+        if start < end:
+            remaining.append({"start": start.strftime(TIME_FORMAT), "end": end.strftime(TIME_FORMAT)})
+    return remaining
+
+
+async def schedule_in_chunks(gpt_input, schedule_chunk, max_tasks_per_chunk=10, concurrency=4):
+    """
+    Hierarchical scheduling for large backlogs: split the problem into chunks of
+    days (`plan_chunks`), schedule the chunks concurrently with `schedule_chunk`,
+    and merge the results.
+
+    Chunks whose call fails are planned locally. Entries that conflict with
+    each other or with busy time are dropped and re-placed by the local planner
+    in the free time that is left.
+
+    Args:
+        gpt_input (dict): Input prepared by `prepare_gpt_input`.
+        schedule_chunk (callable): async function(chunk_input) -> schedule dict.
+        max_tasks_per_chunk (int): Upper bound of tasks per model call.
+        concurrency (int): Chunks scheduled at the same time.
+
+    Returns:
+        dict: {"scheduled_tasks": [...], "reasoning": str, "today": str}
+    """
+    timezone = gpt_input["context"]["timezone"]
+    chunk_inputs = [build_chunk_input(gpt_input, chunk) for chunk in plan_chunks(gpt_input, max_tasks_per_chunk)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chunk_input):
+        async with semaphore:
+            return await schedule_chunk(chunk_input)
+
+    results = await asyncio.gather(*(run(chunk_input) for chunk_input in chunk_inputs), return_exceptions=True)
+
+    scheduled = []
+    reasoning = []
+    today = None
+    task_ids = {task["id"] for task in gpt_input["tasks"]}
+    for chunk_input, result in zip(chunk_inputs, results):
+        if isinstance(result, Exception):
+            print(f"Chunk {chunk_input['context']['start_date']} failed ({result}), planning it locally")
+            result = plan_locally(chunk_input)
+        scheduled.extend(entry for entry in result.get("scheduled_tasks", []) if entry.get("task_id") in task_ids)
+        if result.get("reasoning"):
+            reasoning.append(f"{chunk_input['context']['start_date']}: {result['reasoning']}")
+        if today is None and result.get("today"):
+            today = result["today"]
+
+    # Keep the first valid placement of each task, re-place the rest locally
+    conflicts = find_conflicts(scheduled, gpt_input["free_times"], timezone)
+    conflicting = {id(entry) for entry in conflicts}
+    scheduled = [entry for entry in scheduled if id(entry) not in conflicting]
+
+    placed_ids = {entry["task_id"] for entry in scheduled}
+    leftover = [task for task in gpt_input["tasks"] if task["id"] not in placed_ids]
+    if leftover:
+        print(f"Re-placing {len(leftover)} unscheduled or conflicting task(s) locally")
+        repair = plan_locally({
+            **gpt_input,
+            "tasks": leftover,
+            "free_times": subtract_scheduled(gpt_input["free_times"], scheduled, timezone),
+        })
+        scheduled.extend(repair["scheduled_tasks"])
+        reasoning.append(repair["reasoning"])
+
+    return {
+        "scheduled_tasks": scheduled,
+        "reasoning": "\n".join(reasoning),
+        "today": today or "",
+    }
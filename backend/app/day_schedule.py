@@ -0,0 +1,83 @@
+# Per-day schedule documents: calendar/{YYYY-MM-DD} holds the day's ordered
+# slots with a snapshot of each task, so a day view is a single document read.
+
+DAY_SCHEDULE_VERSION = 1
+
+# Task fields copied into each slot
+SLOT_TASK_FIELDS = ("name", "description", "priority", "dueDate", "estimatedTime", "gcalEventId")
+
+
+def make_slot(task_id, todo):
+    """
+    Slot entry for a scheduled todo (needs "timeSlot" and "scheduledDate").
+    """
+    slot = {"timeSlot": todo["timeSlot"], "task_id": task_id}
+    for field in SLOT_TASK_FIELDS:
+        if todo.get(field) is not None:
+            slot[field] = todo[field]
+    return slot
+
+
+def build_day_documents(todos, updates, updated_at):
+    """
+    Build the day documents affected by a schedule.
+
+    Args:
+        todos (list): Snapshot of all todos (with "id") before the schedule is applied.
+        updates (dict): task_id -> fields written to the todo by the schedule
+            ("scheduledDate", "timeSlot", "gcalEventId").
+        updated_at (str): ISO timestamp stored on each document.
+
+    Returns:
+        dict: date -> day document, for every day that gained or lost a task.
+        Days that lost all their tasks get an empty slot list.
+    """
+    affected_days = set()
+    slots_by_day = {}
+
+    for todo in todos:
+        task_id = todo["id"]
+        if task_id in updates:
+            if todo.get("scheduledDate"):
+                affected_days.add(todo["scheduledDate"])
+            todo = {**todo, **updates[task_id]}
+            affected_days.add(todo["scheduledDate"])
+
+        if todo.get("scheduledDate") and todo.get("timeSlot"):
+            slots_by_day.setdefault(todo["scheduledDate"], []).append(make_slot(task_id, todo))
+
+    documents = {}
+    for day in sorted(affected_days):
+        slots = sorted(slots_by_day.get(day, []), key=lambda slot: slot["timeSlot"])
+        documents[day] = {
+            "date": day,
+            "version": DAY_SCHEDULE_VERSION,
+            "slots": slots,
+            "updatedAt": updated_at,
+        }
+    return documents
+
+
+def remove_task_from_day(day_document, task_id, updated_at):
+    """
+    Copy of a day document without the given task's slot.
+    """
+    return {
+        **day_document,
+        "slots": [slot for slot in day_document.get("slots", []) if slot.get("task_id") != task_id],
+        "updatedAt": updated_at,
+    }
+
+
+def update_task_slot(day_document, task_id, todo, updated_at):
+    """
+    Copy of a day document with the task's slot refreshed from `todo`.
+
+    The slot is removed when `todo` is None (deleted) or no longer scheduled on
+    the document's day.
+    """
+    slots = [slot for slot in day_document.get("slots", []) if slot.get("task_id") != task_id]
+    if todo and todo.get("scheduledDate") == day_document.get("date") and todo.get("timeSlot"):
+        slots.append(make_slot(task_id, todo))
+        slots.sort(key=lambda slot: slot["timeSlot"])
+    return {**day_document, "slots": slots, "updatedAt": updated_at}
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Short break left after each task so the schedule doesn't run back to back
+BREAK_MINUTES = 15
+DEFAULT_TASK_HOURS = 1.0
+
+
+def parse_hours(value):
+    """
+    Parse a task's estimated time (hours, e.g. "1.5" or "2 hours") into a float.
+    """
+    if value is None:
+        return DEFAULT_TASK_HOURS
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(str(value).strip().split()[0])
+    except (ValueError, IndexError):
+        return DEFAULT_TASK_HOURS
+
+
+def merge_busy_times(busy_times):
+    """
+    Sort busy intervals by start and merge the ones that overlap or touch.
+
+    Calendar events and the nightly blocks arrive in no particular order; the
+    free time sweep needs them ordered.
+
+    Args:
+        busy_times (list): {"start", "end"} dicts with comparable values (datetimes).
+
+    Returns:
+        list: Non-overlapping {"start", "end"} dicts in time order.
+    """
+    merged = []
+    for busy in sorted(busy_times, key=lambda b: b["start"]):
+        if merged and busy["start"] <= merged[-1]["end"]:
+            merged[-1]["end"] = max(merged[-1]["end"], busy["end"])
+        else:
+            merged.append({"start": busy["start"], "end": busy["end"]})
+    return merged
+
+
+def free_time_blocks(busy_times, start_time, end_time):
+    """
+    Free time between `start_time` and `end_time` around sorted, merged busy intervals.
+
+    Returns:
+        list: {"start", "end"} dicts formatted with TIME_FORMAT.
+    """
+    free_times = []
+    current_time = start_time
+    for busy in busy_times:
+        if current_time < busy["start"]:
+            free_times.append({
+                "start": current_time.strftime(TIME_FORMAT),
+                "end": min(busy["start"], end_time).strftime(TIME_FORMAT),
+            })
+        current_time = max(current_time, busy["end"])
+        if current_time >= end_time:
+            break
+
+    if current_time < end_time:
+        free_times.append({
+            "start": current_time.strftime(TIME_FORMAT),
+            "end": end_time.strftime(TIME_FORMAT),
+        })
+    return [block for block in free_times if block["start"] < block["end"]]
+
+
+def plan_locally(gpt_input):
+    """
+    Greedy scheduler that needs no model call.
+
+    Tasks are taken in the order given (already prioritized by due date and
+    priority) and placed in the earliest free time block that fits them, leaving
+    a short break after each one. Returns the same structure as the GPT scheduler.
+
+    Args:
+        gpt_input (dict): Input prepared by `prepare_gpt_input`.
+
+    Returns:
+        dict: {"scheduled_tasks": [...], "reasoning": str, "today": str}
+    """
+    free_blocks = [
+        [datetime.strptime(block["start"], TIME_FORMAT), datetime.strptime(block["end"], TIME_FORMAT)]
+        for block in gpt_input["free_times"]
+    ]
+
+    scheduled = []
+    unscheduled = []
+    for task in gpt_input["tasks"]:
+        duration = timedelta(hours=parse_hours(task.get("estimated_time_hours")))
+        placed = False
+        for block in free_blocks:
+            if block[1] - block[0] >= duration:
+                start_time = block[0]
+                end_time = start_time + duration
+                block[0] = min(end_time + timedelta(minutes=BREAK_MINUTES), block[1])
+                scheduled.append({
+                    "task_id": task["id"],
+                    "start_time": start_time.isoformat(),
+                    "end_time": end_time.isoformat(),
+                })
+                placed = True
+                break
+        if not placed:
+            unscheduled.append(task["name"])
+
+    reasoning = (
+        f"Scheduled {len(scheduled)} task(s) in the earliest free blocks, ordered by due date and priority."
+    )
+    if unscheduled:
+        reasoning += f" No free block was long enough for: {', '.join(unscheduled)}."
+
+    start_date = gpt_input["context"]["start_date"]
+    todays_count = sum(1 for task in scheduled if task["start_time"].startswith(start_date))
+    if todays_count:
+        today = f"You have {todays_count} task(s) planned for today. One at a time, you've got this!"
+    else:
+        today = "Nothing is scheduled for today. Enjoy the breathing room."
+
+    return {"scheduled_tasks": scheduled, "reasoning": reasoning, "today": today}
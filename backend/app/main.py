@@ -1,18 +1,42 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import todos, today
+from dotenv import load_dotenv
+from app.responses import add_compression, default_response_class
+from app.resilience import upstream_stats
+from app.shared_cache import get_shared_cache
+from app.routes import todos, today, calendar
 from app.routes.profile import router as profile_router  # Adjust the import path if necessary
 
-app = FastAPI()
+load_dotenv()
+
+app = FastAPI(default_response_class=default_response_class())
 
 @app.get("/")
 async def root():
     return {"message": "API is running!"}
 
+@app.get("/api/upstreams")
+async def get_upstream_stats():
+    # Retry, failure, fallback and circuit breaker counters per upstream
+    return upstream_stats()
+
+@app.get("/api/cache")
+async def get_cache_stats():
+    # Hits, misses and invalidations of the shared cache seen by this worker
+    return get_shared_cache().stats()
+
 # Register the todos routes
 app.include_router(todos.router, prefix="/api/todos", tags=["todos"])
 app.include_router(profile_router, prefix="/profile", tags=["Profile"])
 app.include_router(today.router, prefix="/api/today", tags=["Today"])
+app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
+
+@app.on_event("startup")
+async def start_calendar_watches():
+    # Push channels replace polling Google Calendar for busy-time changes
+    app.state.channel_maintenance = await calendar.start_channel_maintenance()
+
+add_compression(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,145 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+
+# Rough token estimates for the scheduling prompt and answer
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_BASE = 400      # "reasoning" and "today" messages
+OUTPUT_TOKENS_PER_TASK = 80   # One scheduled_tasks entry (id + two ISO datetimes + JSON)
+
+# Upper bounds for max_tokens per model
+SMALL_MODEL_MAX_OUTPUT = 4000
+LARGE_MODEL_MAX_OUTPUT = 16000
+
+_recent_calls = deque(maxlen=200)
+_recent_calls_lock = threading.Lock()
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def estimate_prompt_tokens(prompt):
+    return len(prompt) // CHARS_PER_TOKEN + 1
+
+
+def estimate_output_tokens(task_count):
+    return OUTPUT_TOKENS_BASE + OUTPUT_TOKENS_PER_TASK * task_count
+
+
+def choose_route(gpt_input, prompt):
+    """
+    Pick the planner for a scheduling call based on the problem size.
+
+    - Up to SCHEDULER_LOCAL_MAX_TASKS tasks (default 3): the local greedy
+      planner, no model call. A few tasks fit in the first free blocks by
+      priority; a model adds latency and little else.
+    - Up to SCHEDULER_SMALL_MAX_TASKS tasks (default 10) and
+      SCHEDULER_SMALL_MAX_PROMPT_TOKENS prompt tokens (default 6000):
+      SCHEDULER_SMALL_MODEL (default gpt-4o-mini).
+    - Anything bigger: SCHEDULER_LARGE_MODEL (default gpt-4o).
+
+    Returns:
+        dict: planner ("local" or "openai"), model, max_tokens, token estimates and reason.
+    """
+    task_count = len(gpt_input["tasks"])
+    free_slot_count = len(gpt_input["free_times"])
+    prompt_tokens = estimate_prompt_tokens(prompt)
+    output_tokens = estimate_output_tokens(task_count)
+
+    route = {
+        "task_count": task_count,
+        "free_slot_count": free_slot_count,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+    }
+
+    if task_count <= _env_int("SCHEDULER_LOCAL_MAX_TASKS", 3):
+        route.update(planner="local", model="local", max_tokens=0, reason=f"{task_count} task(s)")
+    elif (task_count <= _env_int("SCHEDULER_SMALL_MAX_TASKS", 10)
+          and prompt_tokens <= _env_int("SCHEDULER_SMALL_MAX_PROMPT_TOKENS", 6000)):
+        route.update(
+            planner="openai",
+            model=os.getenv("SCHEDULER_SMALL_MODEL", "gpt-4o-mini"),
+            max_tokens=min(SMALL_MODEL_MAX_OUTPUT, max(1000, int(output_tokens * 1.5))),
+            reason=f"{task_count} task(s), ~{prompt_tokens} prompt tokens",
+        )
+    else:
+        route.update(
+            planner="openai",
+            model=os.getenv("SCHEDULER_LARGE_MODEL", "gpt-4o"),
+            max_tokens=min(LARGE_MODEL_MAX_OUTPUT, max(3000, int(output_tokens * 1.5))),
+            reason=f"{task_count} task(s), ~{prompt_tokens} prompt tokens",
+        )
+    return route
+
+
+def chunking_settings(gpt_input):
+    """
+    Whether to schedule in chunks of days (`schedule_in_chunks`) instead of one call.
+
+    Used above SCHEDULER_CHUNK_THRESHOLD tasks (default 25), where one answer
+    gets slow and risks running into max_tokens. SCHEDULER_CHUNK_THRESHOLD=0
+    turns chunking off.
+
+    Returns:
+        dict: Keyword arguments for `schedule_in_chunks`, or None for a single call.
+    """
+    threshold = _env_int("SCHEDULER_CHUNK_THRESHOLD", 25)
+    if threshold <= 0 or len(gpt_input["tasks"]) <= threshold:
+        return None
+    return {
+        "max_tasks_per_chunk": _env_int("SCHEDULER_CHUNK_TASKS", 10),
+        "concurrency": _env_int("SCHEDULER_CHUNK_CONCURRENCY", 4),
+    }
+
+
+def record_call(route, latency_seconds, succeeded, usage=None):
+    """
+    Remember the routing decision and outcome of a scheduling call.
+    """
+    entry = {
+        "time": datetime.now().isoformat(),
+        "planner": route["planner"],
+        "model": route["model"],
+        "task_count": route["task_count"],
+        "estimated_prompt_tokens": route["prompt_tokens"],
+        "estimated_output_tokens": route["output_tokens"],
+        "latency_seconds": round(latency_seconds, 3),
+        "succeeded": succeeded,
+    }
+    if usage is not None:
+        entry["prompt_tokens"] = getattr(usage, "prompt_tokens", None)
+        entry["completion_tokens"] = getattr(usage, "completion_tokens", None)
+
+    with _recent_calls_lock:
+        _recent_calls.append(entry)
+    print(f"Scheduling call routed to {entry['model']} ({route['reason']}) took {entry['latency_seconds']}s")
+    return entry
+
+
+def routing_stats():
+    """
+    Summary of recent scheduling calls per model: count, failures and median/max latency.
+    """
+    with _recent_calls_lock:
+        calls = list(_recent_calls)
+
+    by_model = {}
+    for call in calls:
+        by_model.setdefault(call["model"], []).append(call)
+
+    summary = {}
+    for model, model_calls in by_model.items():
+        latencies = sorted(call["latency_seconds"] for call in model_calls)
+        summary[model] = {
+            "calls": len(model_calls),
+            "failures": sum(1 for call in model_calls if not call["succeeded"]),
+            "p50_latency_seconds": latencies[len(latencies) // 2],
+            "max_latency_seconds": latencies[-1],
+        }
+    return {"models": summary, "recent": calls[-20:]}
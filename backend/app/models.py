@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 class Todo(BaseModel):
     id: Optional[str]  # Firestore assigns this when creating a new todo
@@ -8,3 +9,75 @@ class Todo(BaseModel):
     description: Optional[str] = None
     estimatedTime: Optional[str] = None
     priority: str
+
+# Response models: typed responses let FastAPI serialize with pydantic instead of
+# walking every dict with jsonable_encoder. Extra Firestore fields are passed through.
+
+class TodoResponse(Todo):
+    id: str
+    scheduledDate: Optional[str] = None
+    timeSlot: Optional[str] = None
+    gcalEventId: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+class TodaySlot(BaseModel):
+    timeSlot: str
+
+    class Config:
+        extra = "allow"
+
+class TodayResponse(BaseModel):
+    date: str
+    tasks: List[TodaySlot]
+
+class ScheduledTask(BaseModel):
+    task_id: str
+    start_time: str
+    end_time: str
+
+class ScheduleResult(BaseModel):
+    scheduled_tasks: List[ScheduledTask] = []
+    reasoning: Optional[str] = None
+    today: Optional[str] = None
+
+class RescheduleResponse(BaseModel):
+    message: str
+    result: Optional[ScheduleResult] = None
+
+
+def normalize_schedule(output):
+    """
+    Bring a planner's output into the `ScheduleResult` shape before anything is
+    written: task ids become strings, entries without a readable start and end
+    time are dropped, and the messages become strings.
+
+    Returns:
+        dict: {"scheduled_tasks": [...], "reasoning": str or None, "today": str or None}
+    """
+    if not isinstance(output, dict):
+        print(f"Ignoring a schedule that isn't a JSON object: {output!r}")
+        output = {}
+
+    entries = output.get("scheduled_tasks")
+    scheduled = []
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            task_id = entry["task_id"]
+            if isinstance(task_id, bool) or not isinstance(task_id, (str, int)) or task_id == "":
+                raise ValueError(f"bad task_id {task_id!r}")
+            times = [entry["start_time"], entry["end_time"]]
+            for value in times:
+                datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            print(f"Dropping malformed schedule entry {entry!r}: {e}")
+            continue
+        scheduled.append({"task_id": str(task_id), "start_time": times[0], "end_time": times[1]})
+
+    def message(key):
+        value = output.get(key)
+        return value if value is None or isinstance(value, str) else str(value)
+
+    return {"scheduled_tasks": scheduled, "reasoning": message("reasoning"), "today": message("today")}
+
@@ -0,0 +1,80 @@
+import json
+from app.models import Todo
+
+
+# Longest line accepted; longer lines are reported as errors without being buffered
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class LineTooLong(ValueError):
+    """
+    Stands in for a line longer than MAX_LINE_BYTES; `parse_todo_line` raises it.
+    """
+
+
+async def iter_ndjson_lines(chunks, max_line_bytes=MAX_LINE_BYTES):
+    """
+    Yield (line_number, raw_line) for each non-empty line of an NDJSON body as
+    it arrives, without buffering the whole body.
+
+    Lines are yielded as bytes, so a line that isn't valid UTF-8 can be reported
+    on its own instead of failing the whole body. Only new bytes are scanned for
+    newlines, and a line over `max_line_bytes` is dropped as it arrives and
+    yielded as a `LineTooLong` error instead.
+
+    Args:
+        chunks: Async iterator of bytes, e.g. `request.stream()`.
+        max_line_bytes (int): Longest accepted line.
+    """
+    parts = []  # Pieces of the current, unfinished line
+    size = 0
+    too_long = False
+    line_number = 0
+
+    def finish_line():
+        line = b"".join(parts)
+        parts.clear()
+        if too_long:
+            return LineTooLong(f"Line longer than {max_line_bytes} bytes")
+        return line if line.strip() else None
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            piece = chunk[start:] if end == -1 else chunk[start:end]
+            size += len(piece)
+            if size > max_line_bytes:
+                too_long = True
+                parts.clear()
+            elif piece:
+                parts.append(piece)
+            if end == -1:
+                break
+
+            line_number += 1
+            line = finish_line()
+            if line is not None:
+                yield line_number, line
+            size, too_long = 0, False
+            start = end + 1
+
+    line = finish_line()
+    if line is not None:
+        yield line_number + 1, line
+
+
+def parse_todo_line(raw_line):
+    """
+    Decode and validate one NDJSON line as a `Todo`.
+
+    Raises:
+        ValueError: The line isn't UTF-8, isn't a JSON object or isn't a valid todo
+            (pydantic's ValidationError is a ValueError), or is a `LineTooLong`.
+    """
+    if isinstance(raw_line, LineTooLong):
+        raise raw_line
+    data = json.loads(raw_line.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return Todo(**{"id": None, **data})
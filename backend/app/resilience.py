@@ -0,0 +1,301 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Status codes worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Transport errors without a status code that are worth retrying
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ServerNotFoundError"}
+# Failures after which a non-idempotent request certainly wasn't carried out
+UNPROCESSED_STATUS_CODES = {429}
+UNPROCESSED_ERROR_NAMES = {"ConnectionRefusedError", "ServerNotFoundError"}
+# Floor for the per-attempt timeout handed to `fn` near the deadline
+MIN_ATTEMPT_TIMEOUT = 1.0
+
+
+class UpstreamUnavailable(Exception):
+    """
+    An upstream (Google Calendar, OpenAI) could not be reached in time, even after retries.
+    """
+
+    def __init__(self, upstream, message):
+        super().__init__(f"{upstream}: {message}")
+        self.upstream = upstream
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """
+    The upstream's circuit breaker is open, so the call was not attempted.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast after `failure_threshold` consecutive failures.
+
+    After `reset_timeout` seconds one trial call is let through (half-open);
+    its success closes the circuit again, its failure re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.counters = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "short_circuits": 0, "fallbacks": 0, "opened": 0,
+        }
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.counters["short_circuits"] += 1
+                    return False
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    self.counters["short_circuits"] += 1
+                    return False
+                self._trial_in_flight = True
+            self.counters["calls"] += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.counters["successes"] += 1
+            self.consecutive_failures = 0
+            self.state = "closed"
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.counters["opened"] += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.consecutive_failures, **self.counters}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream):
+    with _breakers_lock:
+        if upstream not in _breakers:
+            _breakers[upstream] = CircuitBreaker(upstream)
+        return _breakers[upstream]
+
+
+def record_fallback(upstream):
+    """
+    Count a call answered from a fallback (cache, local planner) instead of the upstream.
+    """
+    get_breaker(upstream).count("fallbacks")
+
+
+def upstream_stats():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def status_code_of(error):
+    """
+    HTTP status of an OpenAI (`status_code`) or googleapiclient (`resp.status`) error.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None and getattr(error, "resp", None) is not None:
+        status = getattr(error.resp, "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_of(error):
+    """
+    Seconds to wait according to the error's Retry-After header, if any.
+    """
+    headers = None
+    if getattr(error, "response", None) is not None:
+        headers = getattr(error.response, "headers", None)
+    elif getattr(error, "resp", None) is not None:
+        headers = error.resp  # httplib2 responses are dicts of lower-cased headers
+    if not headers:
+        return None
+
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS_CODES
+
+
+def was_unprocessed(error):
+    """
+    Whether the upstream certainly didn't carry out the request (rate limited,
+    connection refused), so even a non-idempotent request can be sent again.
+    """
+    if type(error).__name__ in UNPROCESSED_ERROR_NAMES:
+        return True
+    return status_code_of(error) in UNPROCESSED_STATUS_CODES
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """
+    Full-jitter exponential backoff: uniform in [0, min(max_delay, base_delay * 2**attempt)].
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def _attempt_failed(breaker, error, idempotent):
+    """
+    Bookkeeping for a failed attempt. Re-raises errors that are not transient,
+    and transient errors of non-idempotent requests that may have been carried out.
+    """
+    if not is_retryable(error):
+        # The upstream answered, the request itself was wrong
+        breaker.record_success()
+        raise error
+    breaker.record_failure()
+    if not idempotent and not was_unprocessed(error):
+        # e.g. a timeout after the upstream committed an insert: a retry could duplicate it
+        raise UpstreamUnavailable(breaker.name, f"not retrying a non-idempotent request: {error}") from error
+
+
+def _attempt_timeout(upstream, deadline, deadline_at):
+    """
+    Seconds the next attempt may take: what is left of the deadline.
+    """
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        raise UpstreamUnavailable(upstream, f"deadline of {deadline}s exceeded")
+    return max(MIN_ATTEMPT_TIMEOUT, remaining)
+
+
+def _retry_delay(upstream, breaker, error, attempt, deadline, deadline_at, base_delay, max_delay):
+    """
+    Seconds to wait before the next attempt. Raises when the deadline would be exceeded.
+    """
+    delay = retry_after_of(error)
+    if delay is None:
+        delay = backoff_delay(attempt, base_delay, max_delay)
+    if time.monotonic() + delay >= deadline_at:
+        raise UpstreamUnavailable(upstream, f"deadline of {deadline}s exceeded: {error}") from error
+    breaker.count("retries")
+    print(f"{upstream} call failed ({error}), retrying in {delay:.2f}s")
+    return delay
+
+
+def resilient_call(upstream, fn, deadline=20.0, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                   pass_timeout=False, idempotent=True):
+    """
+    Call `fn()` with retries, jittered exponential backoff and a circuit breaker.
+
+    Retry-After headers are honoured. Errors that are not transient (e.g. 400,
+    404, 410) are raised unchanged on the first attempt.
+
+    Args:
+        upstream (str): Name of the upstream, one circuit breaker per name.
+        fn (callable): Function doing the call, without arguments or, with
+            `pass_timeout`, called as fn(timeout) with the seconds left of the deadline.
+        deadline (float): Total seconds allowed for all attempts and waits.
+        max_attempts (int): Maximum number of attempts.
+        pass_timeout (bool): Hand `fn` the remaining time as its per-attempt timeout.
+        idempotent (bool): False for requests that must not be repeated once they
+            may have reached the upstream; only rate limits and refused
+            connections are retried then.
+
+    Raises:
+        CircuitOpenError: The circuit is open, `fn` was not called.
+        UpstreamUnavailable: Retries or the deadline ran out.
+    """
+    breaker = get_breaker(upstream)
+    deadline_at = time.monotonic() + deadline
+
+    for attempt in range(max_attempts):
+        timeout = _attempt_timeout(upstream, deadline, deadline_at)
+        if not breaker.allow():
+            raise CircuitOpenError(upstream, "circuit open, failing fast")
+        try:
+            result = fn(timeout) if pass_timeout else fn()
+        except Exception as error:
+            _attempt_failed(breaker, error, idempotent)
+            last_error = error
+        else:
+            breaker.record_success()
+            return result
+
+        if attempt < max_attempts - 1:
+            time.sleep(_retry_delay(
+                upstream, breaker, last_error, attempt, deadline, deadline_at, base_delay, max_delay
+            ))
+
+    raise UpstreamUnavailable(upstream, f"giving up after {max_attempts} attempts: {last_error}") from last_error
+
+
+async def resilient_call_async(upstream, fn, deadline=20.0, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                               pass_timeout=False, idempotent=True):
+    """
+    Async version of `resilient_call`: `fn()` returns an awaitable and waits
+    between attempts don't block the event loop.
+    """
+    breaker = get_breaker(upstream)
+    deadline_at = time.monotonic() + deadline
+
+    for attempt in range(max_attempts):
+        timeout = _attempt_timeout(upstream, deadline, deadline_at)
+        if not breaker.allow():
+            raise CircuitOpenError(upstream, "circuit open, failing fast")
+        try:
+            result = await (fn(timeout) if pass_timeout else fn())
+        except Exception as error:
+            _attempt_failed(breaker, error, idempotent)
+            last_error = error
+        else:
+            breaker.record_success()
+            return result
+
+        if attempt < max_attempts - 1:
+            await asyncio.sleep(_retry_delay(
+                upstream, breaker, last_error, attempt, deadline, deadline_at, base_delay, max_delay
+            ))
+
+    raise UpstreamUnavailable(upstream, f"giving up after {max_attempts} attempts: {last_error}") from last_error
@@ -0,0 +1,62 @@
+import os
+from typing import Any
+from fastapi.responses import JSONResponse
+
+# Optional fast JSON encoders, orjson preferred over msgspec
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (or msgspec) when available.
+    Values the encoder doesn't know, e.g. Firestore timestamps, are rendered with str().
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+        if msgspec is not None:
+            return msgspec.json.encode(content, enc_hook=str)
+        return super().render(content)
+
+
+def default_response_class():
+    """
+    FastJSONResponse when FAST_JSON_RESPONSES is enabled, FastAPI's JSONResponse otherwise.
+    """
+    if os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes"):
+        if orjson is None and msgspec is None:
+            print("FAST_JSON_RESPONSES is set but neither orjson nor msgspec is installed, using the standard encoder")
+        return FastJSONResponse
+    return JSONResponse
+
+
+def add_compression(app):
+    """
+    Compress responses larger than COMPRESSION_MIN_SIZE bytes (default 1000).
+    Uses brotli (with gzip fallback) when brotli-asgi is installed, gzip otherwise.
+    COMPRESSION=off disables it.
+    """
+    mode = os.getenv("COMPRESSION", "auto").lower()
+    if mode == "off":
+        return
+    minimum_size = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+
+    if mode in ("auto", "br"):
+        try:
+            from brotli_asgi import BrotliMiddleware
+            app.add_middleware(BrotliMiddleware, minimum_size=minimum_size, gzip_fallback=True)
+            return
+        except ImportError:
+            print("brotli-asgi is not installed, falling back to gzip compression")
+
+    from fastapi.middleware.gzip import GZipMiddleware
+    app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
@@ -0,0 +1,186 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pydantic import BaseModel
+from typing import Optional
+from dotenv import load_dotenv
+from datetime import date, timedelta
+import asyncio
+import os
+import secrets
+from app.config import db
+from gcal_utils import (
+    dirty_days,
+    event_store_is_current,
+    handle_push_notification,
+    renew_expiring_channels,
+    stop_watch,
+    watch_calendar,
+    watch_channels,
+)
+
+router = APIRouter()
+load_dotenv()
+
+# How often the background task checks for channels that need renewing
+RENEWAL_INTERVAL_SECONDS = 60 * 60
+# Longest range /days serves in one request
+MAX_DAY_RANGE = 62
+
+
+class WatchRequest(BaseModel):
+    calendar_id: str
+    address: Optional[str] = None
+    token: Optional[str] = None
+
+
+def serialize_channel(channel):
+    """
+    Channel info safe to return from the API (without the verification token).
+    """
+    return {
+        "id": channel["id"],
+        "resourceId": channel["resourceId"],
+        "calendarId": channel["calendarId"],
+        "address": channel["address"],
+        "expiration": channel["expiration"].isoformat(),
+    }
+
+
+def process_notification(channel_id, token, resource_state):
+    """
+    Runs after the webhook has answered Google: delta fetch for the notified calendar.
+    """
+    try:
+        mark_dirty = os.getenv("GCAL_MARK_DIRTY_DAYS", "true").lower() in ("1", "true", "yes")
+        days = handle_push_notification(channel_id, token, resource_state, mark_dirty=mark_dirty)
+        if days:
+            print(f"Calendar change on channel {channel_id} affects: {days}")
+    except Exception as e:
+        print(f"Error processing calendar notification for channel {channel_id}: {e}")
+
+
+@router.post("/notifications", status_code=200)
+async def receive_notification(request: Request, background_tasks: BackgroundTasks):
+    """
+    Webhook for Google Calendar `events.watch` push notifications.
+
+    Google expects a fast 2xx answer, so the delta fetch runs as a background task.
+    """
+    channel_id = request.headers.get("X-Goog-Channel-ID")
+    token = request.headers.get("X-Goog-Channel-Token")
+    resource_state = request.headers.get("X-Goog-Resource-State")
+
+    channel = watch_channels.get(channel_id) if channel_id else None
+    if not channel:
+        # Unknown (e.g. already replaced) channels are acknowledged and ignored
+        return {"status": "ignored"}
+    if not secrets.compare_digest(channel["token"], token or ""):
+        raise HTTPException(status_code=403, detail="Invalid channel token")
+
+    background_tasks.add_task(process_notification, channel_id, token, resource_state)
+    return {"status": "accepted"}
+
+
+@router.get("/watch")
+async def list_watches():
+    """
+    List active calendar push channels.
+    """
+    return [serialize_channel(channel) for channel in watch_channels.all()]
+
+
+@router.post("/watch", status_code=201)
+async def start_watch(watch: WatchRequest):
+    """
+    Start receiving push notifications for a calendar.
+    """
+    try:
+        channel = await asyncio.to_thread(watch_calendar, watch.calendar_id, watch.address, token=watch.token)
+        return serialize_channel(channel)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error starting calendar watch: {e}")
+        raise HTTPException(status_code=500, detail=f"Error starting calendar watch: {str(e)}")
+
+
+@router.delete("/watch/{channel_id}")
+async def end_watch(channel_id: str):
+    """
+    Stop a calendar push channel.
+    """
+    stopped = await asyncio.to_thread(stop_watch, channel_id)
+    if not stopped:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return {"message": "Channel stopped"}
+
+
+@router.get("/dirty-days")
+async def get_dirty_days():
+    """
+    Schedule days whose busy times changed since the last reschedule.
+    """
+    return {"days": dirty_days.snapshot()}
+
+
+@router.get("/days")
+async def get_day_schedules(start: date, end: date):
+    """
+    Materialized schedules for every day from `start` to `end` (inclusive),
+    fetched with one batched read of the calendar/{date} documents.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days + 1 > MAX_DAY_RANGE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DAY_RANGE} days per request")
+
+    try:
+        days = [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+        refs = [db.collection("calendar").document(day) for day in days]
+        documents = {doc.id: doc.to_dict() for doc in db.get_all(refs) if doc.exists}
+
+        return {
+            "days": [
+                {"date": day, "slots": (documents.get(day) or {}).get("slots", [])}
+                for day in days
+            ]
+        }
+    except Exception as e:
+        print(f"Error fetching day schedules: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching day schedules: {str(e)}")
+
+
+async def maintain_channels():
+    """
+    Background loop that renews channels before they expire.
+    """
+    while True:
+        try:
+            renewed = await asyncio.to_thread(renew_expiring_channels)
+            for channel in renewed:
+                print(f"Renewed channel for {channel['calendarId']}: {channel['id']}")
+        except Exception as e:
+            print(f"Error renewing calendar channels: {e}")
+        await asyncio.sleep(RENEWAL_INTERVAL_SECONDS)
+
+
+async def start_channel_maintenance():
+    """
+    Watch the calendars listed in GCAL_WATCH_CALENDARS (comma-separated) and
+    start the renewal loop. Does nothing unless GCAL_WEBHOOK_URL is set, or
+    when several workers run: their local copies are never read (see
+    `event_store_is_current`), so channels would only cost quota and syncs.
+    """
+    if not os.getenv("GCAL_WEBHOOK_URL"):
+        return None
+    if not event_store_is_current():
+        print("Several workers are running, not watching calendars")
+        return None
+
+    calendar_ids = [c.strip() for c in os.getenv("GCAL_WATCH_CALENDARS", "").split(",") if c.strip()]
+    for calendar_id in calendar_ids:
+        try:
+            await asyncio.to_thread(watch_calendar, calendar_id)
+        except Exception as e:
+            print(f"Error watching calendar {calendar_id}: {e}")
+
+    return asyncio.create_task(maintain_channels())
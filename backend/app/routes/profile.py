@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from typing import Optional
 from dotenv import load_dotenv
 from app.config import db
+from app.shared_cache import get_shared_cache
 
 router = APIRouter()
 load_dotenv()
@@ -18,7 +20,11 @@ class Profile(BaseModel):
     long_term_goals: str
 
 
-@router.get("/")
+class ProfileResponse(Profile):
+    id: Optional[str] = None  # Not set for the default empty profile
+
+
+@router.get("/", response_model=ProfileResponse)
 async def get_profile():
     """
     Retrieve the user's profile. If no profile exists, return a default empty profile.
@@ -44,7 +50,7 @@ async def get_profile():
         raise HTTPException(status_code=500, detail=f"Error fetching profile: {str(e)}")
 
 
-@router.put("/")
+@router.put("/", response_model=ProfileResponse)
 async def update_profile(profile: Profile):
     """
     Update the user's profile. If no profile exists, create a new one.
@@ -57,12 +63,14 @@ async def update_profile(profile: Profile):
             doc_ref = profiles_collection.document(doc.id)
             profile_dict = profile.dict(exclude_unset=True)
             doc_ref.update(profile_dict)
+            get_shared_cache().invalidate("profile")  # Scheduling reads the profile through the cache
             profile_dict["id"] = doc.id  # Return Firestore document ID
             return profile_dict
 
         # If no profile exists, create a new one
         profile_dict = profile.dict(exclude_unset=True)
         doc_ref = profiles_collection.add(profile_dict)
+        get_shared_cache().invalidate("profile")
         profile_dict["id"] = doc_ref[1].id  # Add Firestore document ID
         return profile_dict
     except Exception as e:
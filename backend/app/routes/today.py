@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
 from app.config import db
+from app.models import TodayResponse
 
 router = APIRouter()
 
-@router.get("/", status_code=200)
+@router.get("/", status_code=200, response_model=TodayResponse)
 async def get_todays_tasks():
     """
     Fetch tasks scheduled for today from Firestore.
@@ -16,14 +17,18 @@ async def get_todays_tasks():
 
         # Reference to the "calendar" collection for today's date
         calendar_ref = db.collection("calendar").document(today_date)
-        time_slots = calendar_ref.collection("time_slots").stream()
+        day_document = calendar_ref.get().to_dict()
 
-        # Retrieve all tasks from the "time_slots" subcollection
-        todays_tasks = []
-        for slot in time_slots:
-            task = slot.to_dict()
-            task["timeSlot"] = slot.id  # Include the time slot in the response
-            todays_tasks.append(task)
+        if day_document and "slots" in day_document:
+            # Materialized day schedule written by apply_schedule: one read
+            todays_tasks = day_document["slots"]
+        else:
+            # Older days only have the "time_slots" subcollection, one document per slot
+            todays_tasks = []
+            for slot in calendar_ref.collection("time_slots").stream():
+                task = slot.to_dict()
+                task["timeSlot"] = slot.id  # Include the time slot in the response
+                todays_tasks.append(task)
 
         # If no tasks are found, return an empty list
         if not todays_tasks:
@@ -1,17 +1,43 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from dotenv import load_dotenv
+import asyncio
+import hashlib
 import json
+import threading
+import time
 from app.config import db
-from app.models import Todo
-from openai import OpenAI
-from gcal_utils import get_busy_times, create_gcal_event, delete_gcal_event, list_calendars
+from app.models import Todo, TodoResponse, RescheduleResponse, normalize_schedule
+from app.ndjson import iter_ndjson_lines, parse_todo_line
+from typing import List
+from app.local_planner import free_time_blocks, merge_busy_times, plan_locally
+from app.day_schedule import build_day_documents, remove_task_from_day, update_task_slot
+from app.model_routing import choose_route, chunking_settings, record_call, routing_stats
+from app.resilience import UpstreamUnavailable, record_fallback, resilient_call, resilient_call_async
+from app.chunked_scheduling import schedule_in_chunks
+from app.run_log import RunRecorder, start_run
+from app.shared_cache import get_shared_cache
+from openai import AsyncOpenAI, OpenAI
+from gcal_utils import get_busy_times, create_gcal_event, delete_gcal_event, list_calendars, dirty_days
 from datetime import datetime, timedelta
 import pytz  
 
 router = APIRouter()
 load_dotenv()
 
-client = OpenAI()
+# Retries are handled by resilient_call, so the client's own retries are off
+client = OpenAI(max_retries=0, timeout=60.0)
+
+OPENAI_DEADLINE_SECONDS = 90  # Total time allowed for a scheduling call, retries included
+
+SYSTEM_MESSAGE = "You are a logical scheduling assistant. Follow the user's instructions to create an efficient schedule."
+
+
+def make_async_client():
+    # Async clients are bound to the event loop they run on, so each chunked run makes its own
+    return AsyncOpenAI(max_retries=0, timeout=60.0)
 
 def get_local_time():
     # Replace "America/New_York" with your desired timezone
@@ -33,93 +59,169 @@ def primitive_prioritization(todos: list) -> list:
 # Reference to the Firestore "todos" collection
 todos_collection = db.collection("todos")
 
+PROFILE_ID = "1FPowLLVNTchufO5ZF5o"  # Replace with actual user ID
+
+
+def read_user_profile():
+    """
+    Read the user's profile document from Firestore.
+
+    Raises:
+        Exception: The profile doesn't exist.
+    """
+    # Fetch the profile document (assuming a single user for now)
+    profile_ref = db.collection("profiles").document(PROFILE_ID)
+    profile_data = profile_ref.get().to_dict()
+
+    if not profile_data:
+        raise Exception("Profile not found in Firestore.")
+
+    return {
+        "name": profile_data.get("username", "User"),
+        "about": profile_data.get("about", ""),
+        "short_term_goals": profile_data.get("short_term_goals", []),
+        "medium_term_goals": profile_data.get("medium_term_goals", []),
+        "long_term_goals": profile_data.get("long_term_goals", []),
+    }
+
+
 def fetch_user_profile():
     """
-    Fetch the user's profile from the Firestore 'profiles' collection.
+    Fetch the user's profile from the Firestore 'profiles' collection, through
+    the shared cache when it is enabled (invalidated by profile updates).
 
     Returns:
         dict: User profile data (e.g., name, goals, etc.).
     """
     try:
-        # Fetch the profile document (assuming a single user for now)
-        profile_ref = db.collection("profiles").document("1FPowLLVNTchufO5ZF5o")  # Replace with actual user ID
-        profile_data = profile_ref.get().to_dict()
-
-        if not profile_data:
-            raise Exception("Profile not found in Firestore.")
-
-        return {
-            "name": profile_data.get("username", "User"),
-            "about": profile_data.get("about", ""),
-            "short_term_goals": profile_data.get("short_term_goals", []),
-            "medium_term_goals": profile_data.get("medium_term_goals", []),
-            "long_term_goals": profile_data.get("long_term_goals", []),
-        }
+        return get_shared_cache().get_or_compute("profile", PROFILE_ID, read_user_profile)
     except Exception as e:
         print(f"Error fetching user profile: {e}")
         return {}
 
 
+# Runs of schedule_tasks in this process go one at a time: each deletes the
+# events of the previous run, so overlapping runs would leave orphaned events
+schedule_lock = threading.Lock()
+
+
 def schedule_tasks():
     """
     Central function to reschedule all tasks using GPT for intelligent scheduling.
     Fetches tasks, busy times, and free times, and delegates scheduling to GPT.
+    Concurrent calls wait for the running one to finish (see `schedule_lock`).
+
+    With SCHEDULER_RUN_LOG_DIR set, the run's inputs, model output and stage
+    timings are saved as a run log (see app/run_log.py and benchmarks/replay.py).
+    """
+    with schedule_lock:
+        recorder = start_run()
+        try:
+            # Step 1: Fetch all tasks from Firestore
+            with recorder.stage("fetch_todos"):
+                todos = []
+                docs = todos_collection.stream()
+                for doc in docs:
+                    todo = doc.to_dict()
+                    todo["id"] = doc.id  # Include Firestore document ID
+                    todos.append(todo)
+            recorder.record("todos", [dict(todo) for todo in todos])
+
+            # Step 2: Prioritize tasks
+            prioritized_tasks = primitive_prioritization(todos)
+
+            # Step 3: Remove old Google Calendar events
+            with recorder.stage("delete_events"):
+                for task in prioritized_tasks:
+                    if "gcalEventId" in task:
+                        try:
+                            delete_gcal_event(task["gcalEventId"])  # Delete task's Google Calendar event
+                            print(f"Deleted Google Calendar event for task: {task['id']}")
+                        except Exception as e:
+                            print(f"Failed to delete event for task {task['id']}: {e}")
+
+            # Step 4: Fetch existing Google Calendar events (busy times)
+            seen_dirty_days = dirty_days.snapshot()
+            now = datetime.now(pytz.timezone("America/New_York"))
+            end_time = now + timedelta(days=15)  # Schedule tasks for the next 7 days
+            # Align the end to 30 minutes like the start, so runs within the same half hour
+            # build the same prompt and can share cached model answers
+            end_time = end_time.replace(minute=end_time.minute // 30 * 30, second=0, microsecond=0)
+            with recorder.stage("busy_times"):
+                busy_times = get_busy_times(now, end_time)  # Busy periods from Google Calendar
+            recorder.record("now", now.isoformat())
+            recorder.record("end_time", end_time.isoformat())
+            recorder.record("busy_times", busy_times)
+
+            # Convert busy times to timezone-aware datetime objects
+            busy_times = localize_busy_times(busy_times)
+
+            # Step 5: Fetch user profile for context
+            with recorder.stage("profile"):
+                user_profile = fetch_user_profile()
+            recorder.record("profile", user_profile)
+
+            # Step 6: Prepare input for GPT
+            with recorder.stage("prepare_input"):
+                gpt_input = prepare_gpt_input(prioritized_tasks, busy_times, now, end_time, user_profile)
+
+            # Step 7: Call GPT for scheduling
+            with recorder.stage("schedule"):
+                gpt_output = call_gpt_for_scheduling(gpt_input, recorder)
+            # Malformed entries are dropped here, before anything is written
+            gpt_output = normalize_schedule(gpt_output)
+            recorder.record("output", gpt_output)
+
+            # Step 8: Apply GPT's output to Firestore and Google Calendar
+            with recorder.stage("apply"):
+                apply_schedule(gpt_output, todos)
+            dirty_days.discard(seen_dirty_days)  # These calendar changes are reflected in the new schedule
+
+            # Step 9: Print GPT Message for Tasks Due Today
+            print(gpt_output.get("today") or "No message returned from GPT.")
+            print(gpt_output.get("reasoning") or "No message returned from GPT.")
+
+            return gpt_output
+
+        except UpstreamUnavailable as e:
+            print(f"Error in scheduling tasks: {e}")
+            recorder.record("error", str(e))
+            raise HTTPException(status_code=503, detail=f"Scheduling temporarily unavailable: {str(e)}")
+        except HTTPException as e:
+            recorder.record("error", str(e.detail))
+            raise
+        except Exception as e:
+            print(f"Error in scheduling tasks: {e}")
+            recorder.record("error", str(e))
+            raise HTTPException(status_code=500, detail=f"Error in scheduling tasks: {str(e)}")
+        finally:
+            save_run_log(recorder)
+
+
+def save_run_log(recorder):
+    """
+    Writes the run log, if enabled. A failure to write it never fails the run.
     """
     try:
-        # Step 1: Fetch all tasks from Firestore
-        todos = []
-        docs = todos_collection.stream()
-        for doc in docs:
-            todo = doc.to_dict()
-            todo["id"] = doc.id  # Include Firestore document ID
-            todos.append(todo)
-
-        # Step 2: Prioritize tasks
-        prioritized_tasks = primitive_prioritization(todos)
-
-        # Step 3: Remove old Google Calendar events
-        for task in prioritized_tasks:
-            if "gcalEventId" in task:
-                try:
-                    delete_gcal_event(task["gcalEventId"])  # Delete task's Google Calendar event
-                    print(f"Deleted Google Calendar event for task: {task['id']}")
-                except Exception as e:
-                    print(f"Failed to delete event for task {task['id']}: {e}")
-
-        # Step 4: Fetch existing Google Calendar events (busy times)
-        now = datetime.now(pytz.timezone("America/New_York"))
-        end_time = now + timedelta(days=15)  # Schedule tasks for the next 7 days
-        busy_times = get_busy_times(now, end_time)  # Busy periods from Google Calendar
-
-        # Convert busy times to timezone-aware datetime objects
-        busy_times = [
-            {
-                "start": datetime.fromisoformat(busy["start"]).astimezone(pytz.timezone("America/New_York")),
-                "end": datetime.fromisoformat(busy["end"]).astimezone(pytz.timezone("America/New_York")),
-            }
-            for busy in busy_times
-        ]
-
-        # Step 5: Fetch user profile for context
-        user_profile = fetch_user_profile()
-
-        # Step 6: Prepare input for GPT
-        gpt_input = prepare_gpt_input(prioritized_tasks, busy_times, now, end_time, user_profile)
-
-        # Step 7: Call GPT for scheduling
-        gpt_output = call_gpt_for_scheduling(gpt_input)
-
-        # Step 8: Apply GPT's output to Firestore and Google Calendar
-        apply_schedule(gpt_output)
-
-        # Step 9: Print GPT Message for Tasks Due Today
-        print(gpt_output.get("today", "No message returned from GPT."))
-        print(gpt_output.get("reasoning", "No message returned from GPT."))
+        path = recorder.save()
+        if path:
+            print(f"Saved scheduling run log to {path}")
+    except Exception as e:
+        print(f"Failed to save scheduling run log: {e}")
 
 
-    except Exception as e:
-        print(f"Error in scheduling tasks: {e}")
-        raise HTTPException(status_code=500, detail=f"Error in scheduling tasks: {str(e)}")
+def localize_busy_times(busy_times):
+    """
+    Converts busy times from `get_busy_times` (ISO strings) to datetimes in
+    America/New_York, sorted by start and with overlapping intervals merged.
+    """
+    return merge_busy_times([
+        {
+            "start": datetime.fromisoformat(busy["start"]).astimezone(pytz.timezone("America/New_York")),
+            "end": datetime.fromisoformat(busy["end"]).astimezone(pytz.timezone("America/New_York")),
+        }
+        for busy in busy_times
+    ])
 
 
 def prepare_gpt_input(prioritized_tasks, busy_times, start_time, end_time, user_profile):
@@ -142,27 +244,8 @@ def prepare_gpt_input(prioritized_tasks, busy_times, start_time, end_time, user_
         if start_time.minute == 0:  # Handle overflow to the next hour
             start_time += timedelta(hours=1)
 
-    # Define free times based on busy times
-    free_times = []
-    current_time = start_time
-
-    for busy in busy_times:
-        busy_start = busy["start"]
-        busy_end = busy["end"]
-
-        if current_time < busy_start:
-            free_times.append({
-                "start": current_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "end": busy_start.strftime("%Y-%m-%d %H:%M:%S")
-            })
-
-        current_time = max(current_time, busy_end)
-
-    if current_time < end_time:
-        free_times.append({
-            "start": current_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "end": end_time.strftime("%Y-%m-%d %H:%M:%S")
-        })
+    # Define free times based on busy times (sorted and merged by localize_busy_times)
+    free_times = free_time_blocks(busy_times, start_time, end_time)
 
     # Format busy times to exclude unnecessary precision
     formatted_busy_times = [
@@ -203,19 +286,17 @@ def prepare_gpt_input(prioritized_tasks, busy_times, start_time, end_time, user_
 
     return gpt_input
 
-def call_gpt_for_scheduling(gpt_input):
+def build_scheduling_prompt(gpt_input):
     """
-    Calls GPT API to intelligently schedule tasks.
+    Builds the scheduling prompt sent to GPT.
 
     Args:
         gpt_input (dict): Input data for GPT.
 
     Returns:
-        dict: Scheduled tasks with their assigned time slots and a message.
+        str: The prompt.
     """
-    try:
-        # Define the GPT prompt
-        prompt = f"""
+    prompt = f"""
         You are a smart AI assistant who is asked to provide a human like scheduling experience for a high achieving and motivated student based on the following.
 
         **Guiding Principles for Scheduling:**
@@ -283,58 +364,298 @@ def call_gpt_for_scheduling(gpt_input):
 
         In the "today" section, write a motivational message for the user based on the tasks scheduled for today. Focus on encouraging them and showing how their work contributes to their goals.
         """
+    return prompt
+
+
+def parse_gpt_response(gpt_raw_response):
+    """
+    Parses GPT's raw answer into the schedule dict.
+
+    Args:
+        gpt_raw_response (str): Message content returned by GPT.
+
+    Returns:
+        dict: Scheduled tasks with their assigned time slots and a message.
+    """
+    gpt_raw_response = gpt_raw_response.strip()
+
+    # Remove triple backticks if they exist
+    if gpt_raw_response.startswith("```"):
+        gpt_raw_response = gpt_raw_response.strip("```").strip("json").strip()
+
+    if not gpt_raw_response:
+        raise Exception("GPT returned an empty response")
+
+    return json.loads(gpt_raw_response)
+
+
+# Task fields that change the model's answer; scheduled_date and gcal_event_id
+# are rewritten by every run, so they would make every key unique
+SCHEDULE_CACHE_TASK_FIELDS = ("id", "name", "description", "priority", "due_date", "estimated_time_hours")
+
+
+def schedule_cache_key(route, gpt_input):
+    """
+    Shared cache key of a model answer: the model, token limit and the
+    normalized scheduling input (tasks without the fields a run rewrites,
+    free and busy times, context with the profile).
+    """
+    normalized = {
+        "system": SYSTEM_MESSAGE,
+        "tasks": [{field: task.get(field) for field in SCHEDULE_CACHE_TASK_FIELDS} for task in gpt_input["tasks"]],
+        "free_times": gpt_input["free_times"],
+        "busy_times": gpt_input["busy_times"],
+        "context": gpt_input["context"],
+    }
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{route['model']}:{route['max_tokens']}:{digest}"
+
+
+def call_gpt_for_scheduling(gpt_input, recorder=None):
+    """
+    Calls GPT API to intelligently schedule tasks.
+
+    The model is picked by `choose_route` from the number of tasks and the
+    prompt size; trivial problems go to the local planner without a model call.
+    If OpenAI is unavailable (retries exhausted or circuit open), the local
+    planner is used as a fallback. Large backlogs are scheduled in concurrent
+    chunks of days (see `call_gpt_in_chunks`). Model answers are kept in the
+    shared cache, so the same input from another worker or a rerun isn't sent again.
+
+    Args:
+        gpt_input (dict): Input data for GPT.
+        recorder (RunRecorder): Captures the prompt, route and raw model output, if given.
+
+    Returns:
+        dict: Scheduled tasks with their assigned time slots and a message.
+    """
+    recorder = recorder or RunRecorder()
+    settings = chunking_settings(gpt_input)
+    if settings:
+        # Runs in a worker thread (see reschedule_tasks), so it can have its own event loop
+        return asyncio.run(call_gpt_in_chunks(gpt_input, settings, recorder))
+
+    prompt = build_scheduling_prompt(gpt_input)
+    route = choose_route(gpt_input, prompt)
+    recorder.record("prompt", prompt)
+    recorder.record("route", route)
+    started = time.perf_counter()
+
+    if route["planner"] == "local":
+        gpt_output = plan_locally(gpt_input)
+        record_call(route, time.perf_counter() - started, True)
+        return gpt_output
+
+    cache = get_shared_cache()
+    cache_key = schedule_cache_key(route, gpt_input)
+    cached_output = cache.get("schedule", cache_key)
+    if cached_output is not None:
+        print(f"Using the cached {route['model']} schedule for this prompt")
+        recorder.record("cache_hit", True)
+        return cached_output
+
+    try:
         print(prompt)
-        
+
         # Call GPT API
-        completion = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a logical scheduling assistant. Follow the user's instructions to create an efficient schedule."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=3000,
+        completion = resilient_call(
+            "openai",
+            lambda timeout: client.with_options(timeout=timeout).chat.completions.create(
+                model=route["model"],
+                messages=[
+                    {"role": "system", "content": SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=route["max_tokens"],
+            ),
+            deadline=OPENAI_DEADLINE_SECONDS,
+            pass_timeout=True,  # No attempt outlives the deadline
         )
 
         # Parse GPT response
         gpt_raw_response = completion.choices[0].message.content.strip()
         print(f"Raw GPT Response: {gpt_raw_response}")
+        recorder.record("raw_output", gpt_raw_response)
 
-        # Remove triple backticks if they exist
-        if gpt_raw_response.startswith("```"):
-            gpt_raw_response = gpt_raw_response.strip("```").strip("json").strip()
-
-        if not gpt_raw_response:
-            raise Exception("GPT returned an empty response")
-
-        gpt_output = json.loads(gpt_raw_response)  # Parse JSON
+        gpt_output = parse_gpt_response(gpt_raw_response)
+        record_call(route, time.perf_counter() - started, True, completion.usage)
+        cache.set("schedule", cache_key, gpt_output)
         return gpt_output
 
+    except UpstreamUnavailable as e:
+        record_call(route, time.perf_counter() - started, False)
+        print(f"OpenAI unavailable, falling back to the local planner: {e}")
+        record_fallback("openai")
+        recorder.record("fallback", str(e))
+        return plan_locally(gpt_input)
     except Exception as e:
+        record_call(route, time.perf_counter() - started, False)
         print(f"Error calling GPT for scheduling: {e}")
         raise HTTPException(status_code=500, detail="Failed to call GPT for scheduling.")
 
 
-def apply_schedule(gpt_output):
+# Firestore accepts at most 500 writes per batch (also used by the bulk import)
+FIRESTORE_BATCH_LIMIT = 500
+calendar_collection = db.collection("calendar")
+
+
+async def call_gpt_in_chunks(gpt_input, settings, recorder=None):
+    """
+    Schedules a large backlog as several smaller GPT calls made concurrently.
+
+    Tasks are first assigned to groups of days by deadline and free capacity,
+    each group is scheduled by its own (routed) call, and the results are merged
+    and checked for conflicts. Failed chunks are planned locally.
+
+    Args:
+        gpt_input (dict): Input data for GPT.
+        settings (dict): Chunk size and concurrency from `chunking_settings`.
+        recorder (RunRecorder): Captures each chunk's prompt, route and raw output, if given.
+
+    Returns:
+        dict: Scheduled tasks with their assigned time slots and a message.
+    """
+    recorder = recorder or RunRecorder()
+    recorder.record("chunking", settings)
+    started = time.perf_counter()
+    cache = get_shared_cache()
+
+    async with make_async_client() as async_client:
+        async def schedule_chunk(chunk_input):
+            prompt = build_scheduling_prompt(chunk_input)
+            route = choose_route(chunk_input, prompt)
+            chunk_record = {"start_date": chunk_input["context"]["start_date"], "prompt": prompt, "route": route}
+            recorder.append("chunks", chunk_record)
+            chunk_started = time.perf_counter()
+
+            if route["planner"] == "local":
+                output = plan_locally(chunk_input)
+                record_call(route, time.perf_counter() - chunk_started, True)
+                return output
+
+            cache_key = schedule_cache_key(route, chunk_input)
+            cached_output = cache.get("schedule", cache_key)
+            if cached_output is not None:
+                chunk_record["cache_hit"] = True
+                return cached_output
+
+            try:
+                completion = await resilient_call_async(
+                    "openai",
+                    lambda timeout: async_client.with_options(timeout=timeout).chat.completions.create(
+                        model=route["model"],
+                        messages=[
+                            {"role": "system", "content": SYSTEM_MESSAGE},
+                            {"role": "user", "content": prompt},
+                        ],
+                        max_tokens=route["max_tokens"],
+                    ),
+                    deadline=OPENAI_DEADLINE_SECONDS,
+                    pass_timeout=True,
+                )
+                chunk_record["raw_output"] = completion.choices[0].message.content
+                chunk_record["seconds"] = round(time.perf_counter() - chunk_started, 6)
+                output = normalize_schedule(parse_gpt_response(completion.choices[0].message.content))
+                record_call(route, time.perf_counter() - chunk_started, True, completion.usage)
+                cache.set("schedule", cache_key, output)
+                return output
+            except Exception as e:
+                record_call(route, time.perf_counter() - chunk_started, False)
+                chunk_record["error"] = str(e)
+                raise
+
+        gpt_output = await schedule_in_chunks(gpt_input, schedule_chunk, **settings)
+
+    print(f"Scheduled {len(gpt_input['tasks'])} tasks in chunks in {time.perf_counter() - started:.2f}s")
+    return gpt_output
+
+
+def commit_writes(writes, description):
+    """
+    Commits (doc_ref, fields, mode) writes in batches of FIRESTORE_BATCH_LIMIT.
+    Mode is "update", "merge" (set with merge) or "set".
+    """
+    if len(writes) > FIRESTORE_BATCH_LIMIT:
+        print(f"{description} needs {len(writes)} writes, committing in several batches (not atomic)")
+
+    for offset in range(0, len(writes), FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for doc_ref, fields, mode in writes[offset:offset + FIRESTORE_BATCH_LIMIT]:
+            if mode == "update":
+                batch.update(doc_ref, fields)
+            else:
+                batch.set(doc_ref, fields, merge=(mode == "merge"))
+        batch.commit()
+
+
+def day_slot_writes(changes):
+    """
+    Day documents to rewrite after todos changed outside a reschedule, so the
+    day views keep matching the todo list.
+
+    Args:
+        changes (list): (task_id, todo before, todo after) tuples.
+
+    Returns:
+        dict: date -> refreshed day document. Only days already materialized
+        (documents with "slots") are touched.
+    """
+    days = {
+        todo["scheduledDate"]
+        for _, before, after in changes
+        for todo in (before, after)
+        if todo and todo.get("scheduledDate")
+    }
+    if not days:
+        return {}
+
+    updated_at = datetime.now(pytz.timezone("America/New_York")).isoformat()
+    documents = {}
+    for snapshot in db.get_all([calendar_collection.document(day) for day in sorted(days)]):
+        document = snapshot.to_dict() if snapshot.exists else None
+        if not document or "slots" not in document:
+            continue
+        for task_id, before, after in changes:
+            if snapshot.id in ((before or {}).get("scheduledDate"), (after or {}).get("scheduledDate")):
+                document = update_task_slot(document, task_id, after, updated_at)
+        documents[snapshot.id] = document
+    return documents
+
+
+def apply_schedule(gpt_output, todos=None):
     """
     Applies GPT's schedule to Google Calendar and Firestore.
 
+    The todo updates and the per-day schedule documents (`calendar/{date}`) are
+    written in one batch, so the todo list and the day views never disagree.
+
     Args:
         gpt_output (dict): GPT output containing scheduled tasks and summary.
+        todos (list): Snapshot of all todos (with "id"). Fetched if not given.
     """
     try:
         # Extract scheduled tasks from the GPT output
         scheduled_tasks = gpt_output.get("scheduled_tasks", [])
 
+        if todos is None:
+            todos = []
+            for doc in todos_collection.stream():
+                todo = doc.to_dict()
+                todo["id"] = doc.id
+                todos.append(todo)
+        todos_by_id = {todo["id"]: todo for todo in todos}
+
         # Process each scheduled task
+        updates = {}
         for task in scheduled_tasks:
             # Parse task details
             task_id = task["task_id"]
             start_time = datetime.fromisoformat(task["start_time"])
             end_time = datetime.fromisoformat(task["end_time"])
 
-            # Fetch task details from Firestore
-            doc_ref = todos_collection.document(task_id)
-            task_data = doc_ref.get().to_dict()
+            # Look up task details in the snapshot
+            task_data = todos_by_id.get(task_id)
             if not task_data:
                 print(f"Task not found in Firestore: {task_id}")
                 continue
@@ -345,31 +666,63 @@ def apply_schedule(gpt_output):
                 print(f"Failed to create event for task: {task_id}")
                 continue
 
-            # Update Firestore with the scheduled info
-            task_data["scheduledDate"] = start_time.date().isoformat()
-            task_data["timeSlot"] = f"{start_time.time()} - {end_time.time()}"
-            task_data["gcalEventId"] = event.get("id")
-            doc_ref.update(task_data)
+            # Scheduled info for Firestore
+            updates[task_id] = {
+                "scheduledDate": start_time.date().isoformat(),
+                "timeSlot": f"{start_time.time()} - {end_time.time()}",
+                "gcalEventId": event.get("id"),
+            }
+
+        # Todos deleted while the schedule was computed must be left out: Firestore
+        # rejects a whole batch when one of its updates targets a missing document
+        snapshots = db.get_all([todos_collection.document(todo["id"]) for todo in todos])
+        current = {snapshot.id: {**snapshot.to_dict(), "id": snapshot.id} for snapshot in snapshots if snapshot.exists}
+        for task_id in [task_id for task_id in updates if task_id not in current]:
+            print(f"Task deleted during scheduling, removing its new event: {task_id}")
+            try:
+                delete_gcal_event(updates.pop(task_id)["gcalEventId"])
+            except Exception as e:
+                print(f"Failed to delete event for deleted task {task_id}: {e}")
+        todos = [current[todo["id"]] for todo in todos if todo["id"] in current]
+
+        day_documents = build_day_documents(
+            todos, updates, datetime.now(pytz.timezone("America/New_York")).isoformat()
+        )
+
+        writes = [(todos_collection.document(task_id), fields, "update") for task_id, fields in updates.items()]
+        writes += [(calendar_collection.document(day), document, "merge") for day, document in day_documents.items()]
+        commit_writes(writes, "Schedule")
 
     except Exception as e:
         print(f"Error applying schedule: {e}")
         raise HTTPException(status_code=500, detail="Failed to apply schedule.")
 
-@router.post("/reschedule")
+@router.post("/reschedule", response_model=RescheduleResponse)
 async def reschedule_tasks():
     """
     Endpoint to reschedule tasks by calling the existing scheduling method.
     """
     try:
-        # Call the existing scheduling logic
-        result = schedule_tasks()
+        # Call the existing scheduling logic off the event loop: it makes blocking
+        # Firestore, Calendar and OpenAI calls. Overlapping requests are serialized
+        # by schedule_lock
+        result = await run_in_threadpool(schedule_tasks)
 
         return {"message": "Tasks successfully rescheduled", "result": result}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error rescheduling tasks: {e}")
         raise HTTPException(status_code=500, detail="Failed to reschedule tasks")
 
-@router.get("/")
+@router.get("/routing-stats")
+async def get_routing_stats():
+    """
+    Models chosen for recent scheduling calls and their latencies.
+    """
+    return routing_stats()
+
+@router.get("/", response_model=List[TodoResponse])
 async def get_todos():
     try:
         # Debug: Log that the function is being called
@@ -406,17 +759,134 @@ async def create_todo(todo: Todo):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding todo: {str(e)}")
 
+
+
+# Imported todos per commit, leaving room in the batch for day documents of overwritten todos
+IMPORT_BATCH_SIZE = FIRESTORE_BATCH_LIMIT // 2
+
+
+def write_imported_todos(entries):
+    """
+    Writes imported (todo_id or None, fields) entries. Todos overwritten by id
+    lose their schedule: their day slots leave with the write and their
+    Calendar events are deleted once it is committed, like in `delete_todo`.
+
+    Returns:
+        tuple: Numbers of todos created and overwritten.
+    """
+    overwritten_ids = [todo_id for todo_id, _ in entries if todo_id]
+    existing = {}
+    if overwritten_ids:
+        snapshots = db.get_all([todos_collection.document(todo_id) for todo_id in overwritten_ids])
+        existing = {snapshot.id: snapshot.to_dict() for snapshot in snapshots if snapshot.exists}
+
+    writes = [
+        (todos_collection.document(todo_id) if todo_id else todos_collection.document(), fields, "set")
+        for todo_id, fields in entries
+    ]
+    day_documents = day_slot_writes([
+        (todo_id, existing[todo_id], fields) for todo_id, fields in entries if todo_id in existing
+    ])
+    writes += [(calendar_collection.document(day), document, "set") for day, document in day_documents.items()]
+    commit_writes(writes, "Import")
+
+    for todo_id, todo_data in existing.items():
+        gcal_event_id = todo_data.get("gcalEventId")
+        if gcal_event_id:
+            try:
+                delete_gcal_event(gcal_event_id)
+            except Exception as e:
+                print(f"Error deleting Google Calendar event of overwritten todo {todo_id}: {e}")
+
+    updated = sum(1 for todo_id, _ in entries if todo_id in existing)
+    return len(entries) - updated, updated
+
+
+@router.post("/bulk", status_code=200)
+async def bulk_import_todos(request: Request):
+    """
+    Import todos from an NDJSON body (one `Todo` JSON object per line).
+
+    Lines are validated as they are read and written in Firestore batches. Invalid
+    lines are reported and skipped; a line with an "id" overwrites that document,
+    and is counted as updated if it existed.
+    """
+    created = 0
+    updated = 0
+    errors = []
+    pending = []
+
+    try:
+        async for line_number, raw_line in iter_ndjson_lines(request.stream()):
+            try:
+                todo = parse_todo_line(raw_line)
+            except (ValueError, ValidationError) as e:
+                errors.append({"line": line_number, "error": str(e)})
+                continue
+
+            todo_dict = todo.dict(exclude_unset=True)
+            todo_id = todo_dict.pop("id", None)
+            pending.append((todo_id, todo_dict))
+
+            if len(pending) == IMPORT_BATCH_SIZE:
+                # Firestore reads and up to 500 writes, keep the event loop free
+                batch_created, batch_updated = await run_in_threadpool(write_imported_todos, pending)
+                created += batch_created
+                updated += batch_updated
+                pending = []
+
+        if pending:
+            batch_created, batch_updated = await run_in_threadpool(write_imported_todos, pending)
+            created += batch_created
+            updated += batch_updated
+
+        return {"created": created, "updated": updated, "failed": len(errors), "errors": errors}
+    except Exception as e:
+        print(f"Error importing todos: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error importing todos after {created + updated} were written: {str(e)}",
+        )
+
+
+@router.get("/export")
+async def export_todos():
+    """
+    Stream every todo as NDJSON straight from the Firestore cursor.
+    """
+    def generate():
+        for doc in todos_collection.stream():
+            todo = doc.to_dict()
+            todo["id"] = doc.id
+            yield json.dumps(todo, default=str) + "\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=todos.ndjson"},
+    )
+
 @router.put("/{todo_id}")
 async def update_todo(todo_id: str, todo: Todo):
     """
     Update an existing task and trigger scheduling.
     """
     try:
-        # Update the task in Firestore
+        doc_ref = todos_collection.document(todo_id)
+        current = doc_ref.get().to_dict()
+        if not current:
+            raise HTTPException(status_code=404, detail="Todo not found")
+
+        # Update the task in Firestore, together with its slot in the day's schedule
         todo_dict = todo.dict(exclude_unset=True)
-        todos_collection.document(todo_id).update(todo_dict)
+        writes = [(doc_ref, todo_dict, "update")]
+        day_documents = day_slot_writes([(todo_id, current, {**current, **todo_dict})])
+        writes += [(calendar_collection.document(day), document, "set") for day, document in day_documents.items()]
+        commit_writes(writes, "Todo update")
 
         return {"message": "Todo updated successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating todo: {str(e)}")
 
@@ -443,8 +913,17 @@ async def delete_todo(todo_id: str):
             except Exception as e:
                 print(f"Error deleting Google Calendar event: {e}")
 
-        # Step 3: Delete the task from Firestore
-        doc_ref.delete()
+        # Step 3: Delete the task from Firestore, together with its slot in the day's schedule
+        batch = db.batch()
+        batch.delete(doc_ref)
+        scheduled_date = todo_data.get("scheduledDate")
+        if scheduled_date:
+            day_ref = calendar_collection.document(scheduled_date)
+            day_document = day_ref.get().to_dict()
+            if day_document and "slots" in day_document:
+                updated_at = datetime.now(pytz.timezone("America/New_York")).isoformat()
+                batch.set(day_ref, remove_task_from_day(day_document, todo_id, updated_at))
+        batch.commit()
         print(f"Task deleted from Firestore: {todo_id}")
 
         return {"message": "Todo deleted and tasks rescheduled successfully"}
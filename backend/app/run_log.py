@@ -0,0 +1,77 @@
+import gzip
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# Bump when the layout of a run log changes; load_run rejects unknown versions
+RUN_LOG_VERSION = 1
+
+
+class RunRecorder:
+    """
+    Collects the inputs, outputs and stage timings of one `schedule_tasks` run
+    and writes them as a gzipped JSON run log.
+
+    A disabled recorder only times stages, so call sites don't need to check.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.enabled = directory is not None
+        self.run = {
+            "version": RUN_LOG_VERSION,
+            "run_id": uuid.uuid4().hex,
+            "started_at": datetime.now().isoformat(),
+            "timings": {},
+        }
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.run["timings"][name] = round(time.perf_counter() - started, 6)
+
+    def record(self, key, value):
+        if self.enabled:
+            self.run[key] = value
+
+    def append(self, key, value):
+        if self.enabled:
+            self.run.setdefault(key, []).append(value)
+
+    def save(self):
+        """
+        Write the run log. Returns its path, or None when recording is off.
+        """
+        if not self.enabled:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.directory, f"run-{timestamp}-{self.run['run_id'][:8]}.json.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            # Firestore timestamps and other non-JSON values are kept as strings
+            json.dump(self.run, f, default=str)
+        return path
+
+
+def start_run():
+    """
+    Recorder for a new run; it writes to SCHEDULER_RUN_LOG_DIR when that is set.
+    """
+    return RunRecorder(os.getenv("SCHEDULER_RUN_LOG_DIR") or None)
+
+
+def load_run(path):
+    """
+    Read a run log written by `RunRecorder.save`.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        run = json.load(f)
+    if run.get("version") != RUN_LOG_VERSION:
+        raise ValueError(f"Unsupported run log version {run.get('version')} (expected {RUN_LOG_VERSION})")
+    return run
@@ -0,0 +1,317 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Version of each namespace's cached values. Bump one when the shape of what is
+# cached changes, so workers running different code never read each other's entries.
+CACHE_VERSIONS = {
+    "busy_times": 1,
+    "profile": 1,
+    "schedule": 1,
+}
+
+# Seconds an entry lives, overridable with SHARED_CACHE_<NAMESPACE>_TTL
+DEFAULT_TTLS = {
+    "busy_times": 300,
+    "profile": 3600,
+    "schedule": 1800,
+}
+
+
+class NullCache:
+    """
+    Backend that caches nothing (SHARED_CACHE=none, the default).
+    """
+
+    name = "none"
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def incr(self, key):
+        return 0
+
+
+class MemoryCache:
+    """
+    In-process backend. Not shared between workers, for a single worker and tests.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._entries.get(key, (0, None))[0]) + 1
+            self._entries[key] = (str(value), None)
+            return value
+
+
+class SQLiteCache:
+    """
+    On-host backend shared by all workers of a machine: one SQLite file in WAL
+    mode, so readers don't block each other or the writer.
+
+    Connections are per thread and reopened after a fork.
+    """
+
+    name = "sqlite"
+    PURGE_EVERY = 200  # Sets between deletions of expired entries
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl if ttl else None),
+        )
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def incr(self, key):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO entries (key, value, expires_at) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                (key,),
+            )
+            value = int(connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()[0])
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return value
+
+
+class RedisCache:
+    """
+    Backend for any server speaking the Redis protocol (Redis, Valkey, KeyDB,
+    Dragonfly, ...), shared by workers on all hosts. Needs the redis package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def get(self, key):
+        value = self._client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(key, value, ex=int(ttl) if ttl else None)
+
+    def incr(self, key):
+        return int(self._client.incr(key))
+
+
+class SharedCache:
+    """
+    JSON values cached in a backend shared between workers, grouped in namespaces.
+
+    Keys are versioned (CACHE_VERSIONS) and carry the namespace's generation,
+    a counter stored in the backend. `invalidate` bumps it, so every worker
+    misses on its next read; old entries are left to expire.
+
+    Backend errors are logged and treated as misses, the cache never fails a request.
+    """
+
+    def __init__(self, backend, prefix="scheduler", versions=None):
+        self.backend = backend
+        self.prefix = prefix
+        self.versions = versions or CACHE_VERSIONS
+        self.counters = {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return not isinstance(self.backend, NullCache)
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _generation_key(self, namespace):
+        return f"{self.prefix}:generation:{namespace}"
+
+    def versioned_key(self, namespace, key):
+        """
+        Backend key of `key` in the namespace's current version and generation.
+        """
+        generation = self.backend.get(self._generation_key(namespace)) or "0"
+        return f"{self.prefix}:{namespace}:v{self.versions[namespace]}:g{generation}:{key}"
+
+    def _get(self, full_key):
+        try:
+            value = self.backend.get(full_key)
+        except Exception as e:
+            print(f"Shared cache read failed ({self.backend.name}): {e}")
+            self._count("errors")
+            return None
+        self._count("hits" if value is not None else "misses")
+        return json.loads(value) if value is not None else None
+
+    def _set(self, full_key, value, ttl):
+        try:
+            self.backend.set(full_key, json.dumps(value, default=str), ttl)
+            self._count("sets")
+        except Exception as e:
+            print(f"Shared cache write failed ({self.backend.name}): {e}")
+            self._count("errors")
+
+    def _resolve(self, namespace, key):
+        try:
+            return self.versioned_key(namespace, key)
+        except Exception as e:
+            print(f"Shared cache read failed ({self.backend.name}): {e}")
+            self._count("errors")
+            return None
+
+    def get(self, namespace, key):
+        if not self.enabled:
+            return None
+        full_key = self._resolve(namespace, key)
+        return self._get(full_key) if full_key else None
+
+    def set(self, namespace, key, value, ttl=None):
+        if not self.enabled:
+            return
+        full_key = self._resolve(namespace, key)
+        if full_key:
+            self._set(full_key, value, cache_ttl(namespace) if ttl is None else ttl)
+
+    def get_or_compute(self, namespace, key, compute, ttl=None):
+        """
+        Cached value of `key`, or `compute()` stored under it.
+
+        The key is resolved before computing, so a value computed while the
+        namespace is invalidated lands in the old generation and is never read.
+        """
+        if not self.enabled:
+            return compute()
+        full_key = self._resolve(namespace, key)
+        if full_key:
+            value = self._get(full_key)
+            if value is not None:
+                return value
+        value = compute()
+        if full_key:
+            self._set(full_key, value, cache_ttl(namespace) if ttl is None else ttl)
+        return value
+
+    def invalidate(self, namespace):
+        """
+        Drop every entry of the namespace, for all workers sharing the backend.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.backend.incr(self._generation_key(namespace))
+            self._count("invalidations")
+        except Exception as e:
+            print(f"Shared cache invalidation of {namespace} failed ({self.backend.name}): {e}")
+            self._count("errors")
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.backend.name, **self.counters}
+
+
+def cache_ttl(namespace):
+    try:
+        return float(os.getenv(f"SHARED_CACHE_{namespace.upper()}_TTL", DEFAULT_TTLS[namespace]))
+    except ValueError:
+        return DEFAULT_TTLS[namespace]
+
+
+def make_backend():
+    """
+    Backend picked by SHARED_CACHE:
+    - "none" (default): no caching.
+    - "memory": per process.
+    - "sqlite": SQLite file at SHARED_CACHE_PATH (default ./shared-cache.sqlite3),
+      shared by the workers of one host.
+    - "redis": server at SHARED_CACHE_URL (default redis://127.0.0.1:6379/0),
+      shared by all hosts.
+    """
+    mode = os.getenv("SHARED_CACHE", "none").lower()
+    if mode == "memory":
+        return MemoryCache()
+    if mode == "sqlite":
+        try:
+            return SQLiteCache(os.getenv("SHARED_CACHE_PATH", "./shared-cache.sqlite3"))
+        except sqlite3.Error as e:
+            print(f"Could not open the shared cache database ({e}), shared cache disabled")
+    if mode == "redis":
+        try:
+            return RedisCache(os.getenv("SHARED_CACHE_URL", "redis://127.0.0.1:6379/0"))
+        except ImportError:
+            print("redis is not installed, shared cache disabled")
+    return NullCache()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    The process's SharedCache, created on first use.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SharedCache(make_backend())
+        return _shared_cache
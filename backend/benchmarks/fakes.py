@@ -0,0 +1,409 @@
+"""
+In-memory stand-ins for Firestore, the Google Calendar API and OpenAI, with a
+configurable latency per call, for load tests and offline replays.
+
+The fakes block like the real (synchronous) clients do, so event-loop blocking
+measured against them is representative. `install_fakes()` must run before
+`app.main` (or anything importing `app.config` / `gcal_utils`) is imported.
+"""
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+def _pause(latency):
+    if latency:
+        time.sleep(latency)
+
+
+# --- Firestore -------------------------------------------------------------
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    def __init__(self, db, path, doc_id):
+        self._db = db
+        self.path = f"{path}/{doc_id}"
+        self.id = doc_id
+
+    def get(self):
+        _pause(self._db.latency)
+        return FakeSnapshot(self.id, self._db.read(self.path))
+
+    def set(self, data, merge=False):
+        _pause(self._db.latency)
+        self._db.write(self.path, data, merge)
+
+    def update(self, data):
+        _pause(self._db.latency)
+        if self._db.read(self.path) is None:
+            raise KeyError(f"No document to update: {self.path}")
+        self._db.write(self.path, data, True)
+
+    def delete(self):
+        _pause(self._db.latency)
+        self._db.remove(self.path)
+
+    def collection(self, name):
+        return FakeCollection(self._db, f"{self.path}/{name}")
+
+
+class FakeCollection:
+    def __init__(self, db, path, limit=None):
+        self._db = db
+        self._path = path
+        self._limit = limit
+
+    def document(self, doc_id=None):
+        return FakeDocumentRef(self._db, self._path, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data):
+        doc_ref = self.document()
+        doc_ref.set(data)
+        return datetime.now(), doc_ref
+
+    def limit(self, count):
+        return FakeCollection(self._db, self._path, count)
+
+    def stream(self):
+        _pause(self._db.latency)
+        documents = self._db.list(self._path)
+        if self._limit is not None:
+            documents = documents[:self._limit]
+        for doc_id, data in documents:
+            yield FakeSnapshot(doc_id, data)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._operations = []
+
+    def set(self, doc_ref, data, merge=False):
+        self._operations.append(("set", doc_ref.path, data, merge))
+
+    def update(self, doc_ref, data):
+        self._operations.append(("update", doc_ref.path, data, True))
+
+    def delete(self, doc_ref):
+        self._operations.append(("delete", doc_ref.path, None, False))
+
+    def commit(self):
+        _pause(self._db.latency)
+        with self._db.lock:
+            # Like Firestore, one update of a missing document rejects the whole batch
+            for kind, path, _, _ in self._operations:
+                if kind == "update" and self._db.read(path) is None:
+                    raise KeyError(f"No document to update: {path}")
+            for kind, path, data, merge in self._operations:
+                if kind == "delete":
+                    self._db.remove(path)
+                else:
+                    self._db.write(path, data, merge)
+        self._operations = []
+
+
+class FakeFirestore:
+    """
+    Minimal `firestore.client()`: collections, documents, subcollections, batches.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.lock = threading.RLock()
+        self._documents = {}  # "collection/doc[/sub/doc...]" -> dict
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs):
+        _pause(self.latency)
+        return [FakeSnapshot(ref.id, self.read(ref.path)) for ref in refs]
+
+    def read(self, path):
+        with self.lock:
+            data = self._documents.get(path)
+            return dict(data) if data is not None else None
+
+    def write(self, path, data, merge):
+        with self.lock:
+            current = self._documents.get(path, {}) if merge else {}
+            self._documents[path] = {**current, **data}
+
+    def remove(self, path):
+        with self.lock:
+            self._documents.pop(path, None)
+
+    def list(self, collection_path):
+        depth = collection_path.count("/") + 1
+        with self.lock:
+            return [
+                (path.rsplit("/", 1)[1], dict(data))
+                for path, data in self._documents.items()
+                if path.startswith(collection_path + "/") and path.count("/") == depth
+            ]
+
+
+# --- Google Calendar -------------------------------------------------------
+
+class FakeRequest:
+    def __init__(self, latency, fn):
+        self._latency = latency
+        self._fn = fn
+
+    def execute(self, http=None, num_retries=0):
+        _pause(self._latency)
+        return self._fn()
+
+
+class FakeCalendarService:
+    """
+    Minimal `build('calendar', 'v3')` service holding events per calendar.
+    """
+
+    def __init__(self, latency=0.0, calendars=("primary",)):
+        self.latency = latency
+        self.events_by_calendar = {calendar_id: {} for calendar_id in calendars}
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _request(self, fn):
+        with self._lock:
+            self.calls += 1
+        return FakeRequest(self.latency, fn)
+
+    def add_event(self, calendar_id, start, end, creator="someone@example.com", summary="Busy"):
+        event_id = f"evt{next(self._ids)}"
+        self.events_by_calendar.setdefault(calendar_id, {})[event_id] = {
+            "id": event_id,
+            "status": "confirmed",
+            "summary": summary,
+            "creator": {"email": creator},
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": end.isoformat()},
+        }
+        return event_id
+
+    def calendarList(self):
+        return SimpleNamespace(list=lambda **kwargs: self._request(
+            lambda: {"items": [{"id": calendar_id} for calendar_id in self.events_by_calendar]}
+        ))
+
+    def calendars(self):
+        return SimpleNamespace(get=lambda calendarId, **kwargs: self._request(
+            lambda: {"id": calendarId, "summary": calendarId}
+        ))
+
+    def channels(self):
+        return SimpleNamespace(stop=lambda body, **kwargs: self._request(lambda: {}))
+
+    def events(self):
+        return SimpleNamespace(
+            list=lambda **kwargs: self._request(lambda: self._list(**kwargs)),
+            insert=lambda calendarId, body, **kwargs: self._request(lambda: self._insert(calendarId, body)),
+            get=lambda calendarId, eventId, **kwargs: self._request(
+                lambda: self.events_by_calendar.get(calendarId, {})[eventId]
+            ),
+            delete=lambda calendarId, eventId, **kwargs: self._request(
+                lambda: self.events_by_calendar.get(calendarId, {}).pop(eventId, None) and None
+            ),
+            watch=lambda calendarId, body, **kwargs: self._request(lambda: {
+                "id": body["id"],
+                "resourceId": f"res-{calendarId}",
+                "expiration": str(int((time.time() + 7 * 24 * 3600) * 1000)),
+            }),
+        )
+
+    def freebusy(self):
+        return SimpleNamespace(query=lambda body, **kwargs: self._request(lambda: self._freebusy(body)))
+
+    def _freebusy(self, body):
+        calendars = {}
+        for item in body["items"]:
+            events = self._list(item["id"], body["timeMin"], body["timeMax"])["items"]
+            calendars[item["id"]] = {
+                "busy": [{"start": e["start"]["dateTime"], "end": e["end"]["dateTime"]} for e in events]
+            }
+        return {"calendars": calendars}
+
+    def _list(self, calendarId, timeMin=None, timeMax=None, **kwargs):
+        events = list(self.events_by_calendar.get(calendarId, {}).values())
+        if timeMin and timeMax:
+            events = [
+                event for event in events
+                if event["start"]["dateTime"] < timeMax and event["end"]["dateTime"] > timeMin
+            ]
+        events.sort(key=lambda event: event["start"]["dateTime"])
+        return {"items": events, "nextSyncToken": "sync-token"}
+
+    def _insert(self, calendar_id, body):
+        event_id = body.get("id") or f"evt{next(self._ids)}"
+        event = dict(body, id=event_id, status="confirmed", creator={"email": "service@example.com"})
+        self.events_by_calendar.setdefault(calendar_id, {})[event_id] = event
+        return event
+
+
+# --- OpenAI ----------------------------------------------------------------
+
+class FakeOpenAI:
+    """
+    Minimal OpenAI client answering scheduling prompts.
+
+    Latency is `latency` plus `seconds_per_output_token` for every generated
+    token, mimicking how completion time grows with the size of the answer.
+    Tasks from the prompt are placed back to back from 9 AM on the start date.
+    """
+
+    def __init__(self, latency=0.5, seconds_per_output_token=0.0):
+        self.latency = latency
+        self.seconds_per_output_token = seconds_per_output_token
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def with_options(self, **kwargs):
+        return self
+
+    def build_answer(self, prompt):
+        task_ids = re.findall(r'"id": "([^"]+)"', prompt)
+        start_date = re.search(r"\*\*Start and End Dates:\*\* (\d{4}-\d{2}-\d{2})", prompt)
+        day = datetime.strptime(start_date.group(1), "%Y-%m-%d") if start_date else datetime.now()
+        current = day.replace(hour=9, minute=0, second=0, microsecond=0)
+
+        scheduled = []
+        for task_id in task_ids:
+            if current.hour >= 21:
+                current = (current + timedelta(days=1)).replace(hour=9, minute=0)
+            end = current + timedelta(hours=1)
+            scheduled.append({"task_id": task_id, "start_time": current.isoformat(), "end_time": end.isoformat()})
+            current = end + timedelta(minutes=15)
+
+        return json.dumps({
+            "scheduled_tasks": scheduled,
+            "reasoning": "Tasks placed back to back by the fake model.",
+            "today": "Keep going!",
+        })
+
+    def create(self, model, messages, max_tokens=None, **kwargs):
+        self.calls += 1
+        content = self.build_answer(messages[-1]["content"])
+        completion_tokens = len(content) // 4
+        _pause(self.latency + self.seconds_per_output_token * completion_tokens)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=len(messages[-1]["content"]) // 4, completion_tokens=completion_tokens
+            ),
+        )
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    """
+    Async flavour of FakeOpenAI, waiting without blocking the event loop.
+    """
+
+    async def create(self, model, messages, max_tokens=None, **kwargs):
+        self.calls += 1
+        content = self.build_answer(messages[-1]["content"])
+        completion_tokens = len(content) // 4
+        await asyncio.sleep(self.latency + self.seconds_per_output_token * completion_tokens)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=len(messages[-1]["content"]) // 4, completion_tokens=completion_tokens
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# --- Wiring ----------------------------------------------------------------
+
+PROFILE_ID = "1FPowLLVNTchufO5ZF5o"  # Profile document read by fetch_user_profile
+
+
+def seed(db, calendar, todo_count=50, days=15, events_per_day=2, start=None):
+    """
+    Fill the fakes with a profile, `todo_count` todos and a few calendar events a day.
+    """
+    start = start or datetime.now()
+    db.collection("profiles").document(PROFILE_ID).set({
+        "username": "Load Test",
+        "about": "Synthetic user",
+        "short_term_goals": "Finish assignments",
+        "medium_term_goals": "Pass the semester",
+        "long_term_goals": "Graduate",
+    })
+    for i in range(todo_count):
+        db.collection("todos").document(f"todo{i:05d}").set({
+            "name": f"Assignment {i}",
+            "description": "Synthetic task",
+            "dueDate": (start + timedelta(days=1 + i % days)).strftime("%Y-%m-%d"),
+            "estimatedTime": str(1 + i % 3),
+            "priority": ("High", "Medium", "Low")[i % 3],
+        })
+    for day in range(days):
+        for event in range(events_per_day):
+            event_start = (start + timedelta(days=day)).replace(hour=10 + 3 * event, minute=0, second=0, microsecond=0)
+            calendar.add_event("primary", event_start, event_start + timedelta(hours=1))
+
+
+_installed = None
+
+
+def install_fakes(firestore_latency=0.0, gcal_latency=0.0, openai_latency=0.0,
+                  openai_seconds_per_token=0.0):
+    """
+    Patch the Firebase and Google client constructors so importing the app uses
+    the fakes, then import the app and swap in the fake OpenAI client.
+
+    The app binds its clients once at import, so later calls in the same
+    process return the fakes of the first call (and ignore the latencies).
+
+    Returns:
+        SimpleNamespace: app, db, calendar and openai fakes.
+    """
+    global _installed
+    if _installed is not None:
+        return _installed
+
+    db = FakeFirestore(firestore_latency)
+    calendar = FakeCalendarService(gcal_latency)
+    openai = FakeOpenAI(openai_latency, openai_seconds_per_token)
+
+    patch("firebase_admin.credentials.Certificate", lambda *args, **kwargs: None).start()
+    patch("firebase_admin.initialize_app", lambda *args, **kwargs: None).start()
+    patch("firebase_admin.firestore.client", lambda *args, **kwargs: db).start()
+    patch("google.oauth2.service_account.Credentials.from_service_account_file",
+          lambda *args, **kwargs: None).start()
+    patch("googleapiclient.discovery.build", lambda *args, **kwargs: calendar).start()
+
+    from app.main import app
+    import app.routes.todos as todos_module
+    todos_module.client = openai
+    todos_module.make_async_client = lambda: FakeAsyncOpenAI(openai_latency, openai_seconds_per_token)
+
+    _installed = SimpleNamespace(app=app, db=db, calendar=calendar, openai=openai)
+    return _installed
@@ -0,0 +1,239 @@
+"""
+Load generator for the FastAPI app, backed by the fakes in benchmarks/fakes.py.
+
+Drives a mixed workload at a target request rate (open loop: requests are sent
+on schedule whether or not earlier ones finished) and reports per route:
+throughput, p50/p95/p99 latency, errors and, in-process, the time the route
+kept the event loop busy (total, in callbacks over --slow-ms, and the longest one).
+
+In-process (the app runs in this process, through httpx's ASGI transport):
+
+    cd backend && python -m benchmarks.load_test run --rps 50 --duration 30 \\
+        --mix todos=60,today=35,reschedule=5 --firestore-latency 0.02 --openai-latency 2
+
+Against a local uvicorn started with the same fakes:
+
+    cd backend && python -m benchmarks.load_test serve --port 8001
+    cd backend && python -m benchmarks.load_test run --url http://127.0.0.1:8001 --rps 50
+
+Requires httpx (and uvicorn for `serve`).
+"""
+import argparse
+import asyncio
+import contextvars
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.fakes import install_fakes, seed
+
+ROUTES = {
+    "todos": ("GET", "/api/todos/"),
+    "today": ("GET", "/api/today/"),
+    "profile": ("GET", "/profile/"),
+    "reschedule": ("POST", "/api/todos/reschedule"),
+    "export": ("GET", "/api/todos/export"),
+}
+
+current_route = contextvars.ContextVar("current_route", default=None)
+
+
+class LoopMonitor:
+    """
+    Times every event-loop callback and charges it to the route whose request
+    scheduled it (through the `current_route` context variable). Work handed to
+    the threadpool doesn't count: it doesn't block the loop.
+    """
+
+    def __init__(self, slow_seconds):
+        self.slow_seconds = slow_seconds
+        self.busy = defaultdict(float)
+        self.blocked = defaultdict(float)
+        self.longest = defaultdict(float)
+        self._original_run = None
+
+    def install(self):
+        monitor = self
+        original_run = asyncio.events.Handle._run
+        self._original_run = original_run
+
+        def timed_run(handle):
+            started = time.perf_counter()
+            try:
+                return original_run(handle)
+            finally:
+                elapsed = time.perf_counter() - started
+                context = getattr(handle, "_context", None)
+                route = context.get(current_route) if context is not None else None
+                if route is not None:
+                    monitor.busy[route] += elapsed
+                    if elapsed >= monitor.slow_seconds:
+                        monitor.blocked[route] += elapsed
+                    monitor.longest[route] = max(monitor.longest[route], elapsed)
+
+        asyncio.events.Handle._run = timed_run
+
+    def uninstall(self):
+        if self._original_run is not None:
+            asyncio.events.Handle._run = self._original_run
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route {name!r}, choose from {', '.join(ROUTES)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+async def send(client, route, results):
+    current_route.set(route)
+    method, path = ROUTES[route]
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path)
+        await response.aread()
+        ok = response.status_code < 400
+    except Exception as e:
+        print(f"{route} request failed: {e}")
+        ok = False
+    results[route].append((time.perf_counter() - started, ok))
+
+
+async def drive(client, mix, rps, duration, poisson):
+    """
+    Fire requests at `rps` for `duration` seconds and wait for all of them.
+    """
+    routes, weights = zip(*mix.items())
+    results = defaultdict(list)
+    tasks = []
+    started = time.perf_counter()
+    next_at = started
+
+    while next_at - started < duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        route = random.choices(routes, weights)[0]
+        # Each task copies the current context, so set the route inside it
+        tasks.append(asyncio.create_task(send(client, route, results)))
+        next_at += random.expovariate(rps) if poisson else 1.0 / rps
+
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - started
+
+
+def report(results, elapsed, monitor=None):
+    header = f"{'route':<11} {'reqs':>6} {'err':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if monitor:
+        header += f" {'loop ms':>9} {'blocked ms':>11} {'max cb ms':>10}"
+    print(header)
+    for route in sorted(results):
+        latencies = [latency for latency, _ in results[route]]
+        errors = sum(1 for _, ok in results[route] if not ok)
+        line = (
+            f"{route:<11} {len(latencies):>6} {errors:>5} {len(latencies) / elapsed:>7.1f} "
+            f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f}"
+        )
+        if monitor:
+            line += (
+                f" {monitor.busy[route] * 1000:>9.1f} {monitor.blocked[route] * 1000:>11.1f}"
+                f" {monitor.longest[route] * 1000:>10.1f}"
+            )
+        print(line)
+    total = sum(len(r) for r in results.values())
+    print(f"total: {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+
+
+def make_fakes(args):
+    fakes = install_fakes(
+        firestore_latency=args.firestore_latency,
+        gcal_latency=args.gcal_latency,
+        openai_latency=args.openai_latency,
+        openai_seconds_per_token=args.openai_seconds_per_token,
+    )
+    seed(fakes.db, fakes.calendar, todo_count=args.todos)
+    return fakes
+
+
+async def run(args):
+    mix = parse_mix(args.mix)
+    monitor = None
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        fakes = make_fakes(args)
+        monitor = LoopMonitor(args.slow_ms / 1000)
+        monitor.install()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fakes.app), base_url="http://loadtest", timeout=args.timeout
+        )
+
+    try:
+        async with client:
+            results, elapsed = await drive(client, mix, args.rps, args.duration, args.poisson)
+    finally:
+        if monitor:
+            monitor.uninstall()
+
+    report(results, elapsed, monitor)
+
+
+def serve(args):
+    import uvicorn
+
+    fakes = make_fakes(args)
+    uvicorn.run(fakes.app, host=args.host, port=args.port, log_level="warning")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API against fake upstreams.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_fake_options(subparser):
+        subparser.add_argument("--todos", type=int, default=50, help="Todos seeded into the fake Firestore")
+        subparser.add_argument("--firestore-latency", type=float, default=0.01, help="Seconds per Firestore call")
+        subparser.add_argument("--gcal-latency", type=float, default=0.05, help="Seconds per Calendar request")
+        subparser.add_argument("--openai-latency", type=float, default=1.0, help="Seconds per OpenAI call")
+        subparser.add_argument("--openai-seconds-per-token", type=float, default=0.0,
+                               help="Extra OpenAI latency per generated token")
+
+    run_parser = subparsers.add_parser("run", help="Generate load")
+    add_fake_options(run_parser)
+    run_parser.add_argument("--url", help="Base URL of a running server (default: run the app in-process)")
+    run_parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    run_parser.add_argument("--duration", type=float, default=20.0, help="Seconds to generate load for")
+    run_parser.add_argument("--mix", default="todos=60,today=35,reschedule=5",
+                            help="Route weights, from: " + ", ".join(ROUTES))
+    run_parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times")
+    run_parser.add_argument("--slow-ms", type=float, default=10.0,
+                            help="Loop callbacks at least this long count as blocking")
+    run_parser.add_argument("--timeout", type=float, default=120.0)
+
+    serve_parser = subparsers.add_parser("serve", help="Run uvicorn with the fakes installed")
+    add_fake_options(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8001)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args)
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Replays a scheduling run log (written by `schedule_tasks` when
+SCHEDULER_RUN_LOG_DIR is set) offline, against the fakes in benchmarks/fakes.py.
+
+Re-runs the stages after the upstream reads with the recorded inputs:
+prompt building (checked against the recorded prompt), planning, validation of
+the schedule (conflicts, unscheduled and unknown tasks) and applying it to the
+fake Firestore and Calendar. Reports each stage's time next to the recorded one.
+
+    cd backend && python -m benchmarks.replay runs/run-20261019T101500-1a2b3c4d.json.gz
+
+    # Try a planner change against a real workload, 5 repetitions
+    cd backend && python -m benchmarks.replay run.json.gz --planner local --repeat 5
+
+Planners: "recorded" re-parses the recorded model output, "local" uses the local
+planner, "fake" goes through call_gpt_for_scheduling (routing, chunking) with
+the fake OpenAI client.
+"""
+import argparse
+import difflib
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+from app.run_log import load_run
+from benchmarks.fakes import PROFILE_ID, install_fakes
+
+
+def timed(timings, name, fn):
+    started = time.perf_counter()
+    result = fn()
+    timings.setdefault(name, []).append(time.perf_counter() - started)
+    return result
+
+
+def prompt_diff(recorded, replayed, max_lines=20):
+    lines = list(difflib.unified_diff(
+        recorded.splitlines(), replayed.splitlines(), "recorded", "replayed", lineterm="", n=1,
+    ))
+    return lines[:max_lines]
+
+
+def compare_chunk_prompts(run, gpt_input, build_prompt):
+    """
+    Rebuilds the chunk prompts of a chunked run with its recorded chunk settings
+    and compares them, by chunk start date, with the recorded ones.
+    """
+    from app.chunked_scheduling import build_chunk_input, plan_chunks
+
+    chunks = plan_chunks(gpt_input, run["chunking"]["max_tasks_per_chunk"])
+    replayed = {}
+    for chunk in chunks:
+        chunk_input = build_chunk_input(gpt_input, chunk)
+        replayed[chunk_input["context"]["start_date"]] = build_prompt(chunk_input)
+
+    diff = []
+    for chunk in run["chunks"]:
+        prompt = replayed.pop(chunk["start_date"], "")
+        diff.extend(prompt_diff(chunk["prompt"], prompt))
+    for start_date in replayed:
+        diff.append(f"+ chunk {start_date} not in the recording")
+    return {"matches_recording": not diff, "chunks": len(run["chunks"]), "diff": diff[:20]}
+
+
+def validate(output, gpt_input):
+    """
+    Checks a schedule against the replayed input.
+
+    Returns:
+        dict: Counts of scheduled, conflicting, unscheduled and unknown tasks.
+    """
+    from app.chunked_scheduling import find_conflicts
+
+    scheduled = output.get("scheduled_tasks", [])
+    task_ids = {task["id"] for task in gpt_input["tasks"]}
+    placed_ids = {entry.get("task_id") for entry in scheduled}
+    return {
+        "scheduled": len(scheduled),
+        "conflicts": len(find_conflicts(scheduled, gpt_input["free_times"], gpt_input["context"]["timezone"])),
+        "unscheduled": len(task_ids - placed_ids),
+        "unknown": len(placed_ids - task_ids),
+    }
+
+
+def replay(run, planner="recorded", repeat=1):
+    """
+    Replays a run log `repeat` times.
+
+    Returns:
+        dict: Stage timings (recorded and replayed medians), prompt check and validation.
+    """
+    fakes = install_fakes()
+    import app.routes.todos as todos_module
+    from app.local_planner import plan_locally
+
+    if run.get("error") and "output" not in run:
+        print(f"Note: the recorded run failed ({run['error']}), replaying as far as the log allows")
+
+    now = datetime.fromisoformat(run["now"])
+    end_time = datetime.fromisoformat(run["end_time"])
+    fakes.db.collection("profiles").document(PROFILE_ID).set({
+        "username": run.get("profile", {}).get("name", "User"),
+        **{key: value for key, value in run.get("profile", {}).items() if key != "name"},
+    })
+
+    timings = {}
+    report = {"run_id": run["run_id"], "started_at": run["started_at"], "planner": planner}
+
+    for _ in range(repeat):
+        todos = [dict(todo) for todo in run["todos"]]
+        for todo in todos:
+            fakes.db.collection("todos").document(todo["id"]).set(
+                {key: value for key, value in todo.items() if key != "id"}
+            )
+
+        def prepare():
+            busy_times = todos_module.localize_busy_times(run["busy_times"])
+            prioritized = todos_module.primitive_prioritization([dict(todo) for todo in todos])
+            return todos_module.prepare_gpt_input(prioritized, busy_times, now, end_time, run.get("profile", {}))
+
+        gpt_input = timed(timings, "prepare_input", prepare)
+        prompt = timed(timings, "build_prompt", lambda: todos_module.build_scheduling_prompt(gpt_input))
+
+        if planner == "local":
+            output = timed(timings, "schedule", lambda: plan_locally(gpt_input))
+        elif planner == "fake":
+            output = timed(timings, "schedule", lambda: todos_module.call_gpt_for_scheduling(gpt_input))
+        elif "raw_output" in run:
+            output = timed(timings, "schedule", lambda: todos_module.parse_gpt_response(run["raw_output"]))
+        elif "output" in run:
+            # Chunked runs and local/fallback plans: the merged output is what was applied
+            output = run["output"]
+        else:
+            raise SystemExit("The run log has no model output to replay, use --planner local or fake")
+
+        report["validation"] = timed(timings, "validate", lambda: validate(output, gpt_input))
+        timed(timings, "apply", lambda: todos_module.apply_schedule(output, [dict(todo) for todo in todos]))
+
+    if "prompt" in run:
+        diff = prompt_diff(run["prompt"], prompt)
+        report["prompt"] = {"matches_recording": not diff, "diff": diff}
+    elif "chunks" in run:
+        report["prompt"] = compare_chunk_prompts(run, gpt_input, todos_module.build_scheduling_prompt)
+
+    report["timings"] = {
+        stage: {
+            "recorded_seconds": run["timings"].get(stage),
+            "replayed_median_seconds": round(statistics.median(values), 6),
+        }
+        for stage, values in timings.items()
+    }
+    report["recorded_timings"] = run["timings"]
+    return report
+
+
+def print_report(report):
+    print(f"\nRun {report['run_id']} (recorded {report['started_at']}), planner: {report['planner']}")
+    prompt = report.get("prompt")
+    if prompt:
+        if prompt["matches_recording"]:
+            print("Prompt: identical to the recording")
+        else:
+            print("Prompt: differs from the recording")
+            for line in prompt["diff"]:
+                print(f"  {line}")
+    print(f"Validation: {report['validation']}")
+
+    print(f"\n{'stage':<16}{'recorded s':>12}{'replayed s':>12}")
+    for stage, values in report["timings"].items():
+        recorded = values["recorded_seconds"]
+        recorded = f"{recorded:.4f}" if recorded is not None else "-"
+        print(f"{stage:<16}{recorded:>12}{values['replayed_median_seconds']:>12.4f}")
+    print(f"\nRecorded stages: {report['recorded_timings']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a scheduling run log against fake upstreams.")
+    parser.add_argument("run_log", help="Path of a run-*.json.gz file")
+    parser.add_argument("--planner", choices=("recorded", "local", "fake"), default="recorded")
+    parser.add_argument("--repeat", type=int, default=1, help="Times to replay, timings are medians")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # Replays must not write run logs of their own or need real credentials
+    os.environ.pop("SCHEDULER_RUN_LOG_DIR", None)
+    os.environ.setdefault("OPENAI_API_KEY", "replay")
+
+    report = replay(load_run(args.run_log), planner=args.planner, repeat=max(1, args.repeat))
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Per-request CPU cost and payload size of the todo list response with FastAPI's
+default JSON encoding versus the typed response model + FastJSONResponse, with
+and without compression.
+
+Requests are sent straight to the ASGI app, so only routing, serialization and
+compression are measured (no network, no Firestore).
+
+    cd backend && python -m benchmarks.serialization --todos 50 200 1000
+"""
+import argparse
+import asyncio
+import gzip
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+
+from app.models import TodoResponse
+from app.responses import FastJSONResponse
+
+
+def make_todos(count):
+    """
+    Synthetic todos shaped like the documents in the "todos" collection.
+    """
+    start = datetime(2024, 9, 1)
+    todos = []
+    for i in range(count):
+        due = start + timedelta(days=random.randint(0, 90))
+        scheduled = due - timedelta(days=random.randint(0, 5))
+        todos.append({
+            "id": f"todo{i:06d}",
+            "name": f"Assignment {i}",
+            "dueDate": due.strftime("%Y-%m-%d"),
+            "description": "Read the chapter, take notes and answer the review questions. " * 2,
+            "estimatedTime": str(random.choice([0.5, 1, 1.5, 2, 3])),
+            "priority": random.choice(["High", "Medium", "Low"]),
+            "scheduledDate": scheduled.strftime("%Y-%m-%d"),
+            "timeSlot": "14:00:00 - 15:30:00",
+            "gcalEventId": f"evt{i:010d}",
+        })
+    return todos
+
+
+def build_app(todos, fast, compress):
+    if fast:
+        app = FastAPI(default_response_class=FastJSONResponse)
+
+        @app.get("/todos", response_model=List[TodoResponse])
+        async def list_todos():
+            return todos
+    else:
+        app = FastAPI(default_response_class=JSONResponse)
+
+        @app.get("/todos")
+        async def list_todos():
+            return todos
+
+    if compress:
+        app.add_middleware(GZipMiddleware, minimum_size=1000)
+    return app
+
+
+async def call(app, accept_encoding):
+    """
+    Send one GET /todos through the ASGI interface and return the response body.
+    """
+    headers = [(b"host", b"bench")]
+    if accept_encoding:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/todos", "raw_path": b"/todos", "root_path": "",
+        "query_string": b"", "headers": headers, "client": ("bench", 0), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app, accept_encoding, iterations):
+    await call(app, accept_encoding)  # warm up routing and model caches
+    started = time.process_time()
+    for _ in range(iterations):
+        body = await call(app, accept_encoding)
+    cpu_ms = (time.process_time() - started) * 1000 / iterations
+    return cpu_ms, len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of the todo list.")
+    parser.add_argument("--todos", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    variants = [
+        ("default", False, False),
+        ("default+gzip", False, True),
+        ("fast", True, False),
+        ("fast+gzip", True, True),
+    ]
+
+    print(f"{'todos':>6} {'variant':<14} {'cpu ms/req':>11} {'bytes':>10}")
+    for count in args.todos:
+        todos = make_todos(count)
+        baseline = None
+        for name, fast, compress in variants:
+            app = build_app(todos, fast, compress)
+            cpu_ms, size = await measure(app, "gzip" if compress else None, args.iterations)
+            baseline = baseline or cpu_ms
+            print(f"{count:>6} {name:<14} {cpu_ms:>11.3f} {size:>10} ({cpu_ms / baseline:.2f}x cpu)")
+
+        raw = (await call(build_app(todos, True, False), None))
+        print(f"{count:>6} {'gzip level 9':<14} {'':>11} {len(gzip.compress(raw, 9)):>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+# fake_gcal_push.py
+"""
+Local stand-in for Google's push service: posts `events.watch` style
+notifications to the webhook of a running backend.
+
+By default it notifies every channel the backend reports at /api/calendar/watch.
+Tokens are not exposed by the API, so register the channel with a known token
+(POST /api/calendar/watch {"calendar_id": ..., "token": ...}) and pass it here.
+
+    python fake_gcal_push.py --base-url http://localhost:3400 --token <token>
+"""
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+
+
+def post_notification(base_url, channel_id, token, resource_id, state, message_number):
+    request = urllib.request.Request(
+        f"{base_url}/api/calendar/notifications",
+        data=b"",
+        method="POST",
+        headers={
+            "X-Goog-Channel-ID": channel_id,
+            "X-Goog-Channel-Token": token or "",
+            "X-Goog-Resource-ID": resource_id or "",
+            "X-Goog-Resource-State": state,
+            "X-Goog-Message-Number": str(message_number),
+        },
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read().decode()
+
+
+def list_channels(base_url):
+    with urllib.request.urlopen(f"{base_url}/api/calendar/watch") as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post fake Google Calendar push notifications.")
+    parser.add_argument("--base-url", default="http://localhost:3400")
+    parser.add_argument("--channel-id", help="Channel to notify (default: every active channel)")
+    parser.add_argument("--token", help="Channel verification token")
+    parser.add_argument("--resource-id")
+    parser.add_argument("--state", default="exists", choices=["sync", "exists", "not_exists"])
+    parser.add_argument("--count", type=int, default=1, help="Notifications per channel")
+    parser.add_argument("--interval", type=float, default=0.0, help="Seconds between notifications")
+    args = parser.parse_args()
+
+    if args.channel_id:
+        channels = [{"id": args.channel_id, "resourceId": args.resource_id}]
+    else:
+        channels = list_channels(args.base_url)
+        if not channels:
+            print("No active channels on the server.")
+            return
+
+    for message_number in range(1, args.count + 1):
+        for channel in channels:
+            status, body = post_notification(
+                args.base_url, channel["id"], args.token, channel.get("resourceId"), args.state, message_number
+            )
+            print(f"[{message_number}] {channel['id']}: {status} {body}")
+        if args.interval:
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
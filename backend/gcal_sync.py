@@ -0,0 +1,199 @@
+# gcal_sync.py
+import threading
+from datetime import datetime, timedelta
+
+
+def parse_event_time(value, tzinfo=None):
+    """
+    Parse a Google Calendar start/end value ({"dateTime": ...} or {"date": ...})
+    into a timezone-aware datetime. All-day dates are taken as midnight in `tzinfo`.
+    """
+    raw = value.get("dateTime", value.get("date"))
+    if raw is None:
+        return None
+    parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    if parsed.tzinfo is None and tzinfo is not None:
+        # pytz zones must be applied with localize() to get the right offset
+        parsed = tzinfo.localize(parsed) if hasattr(tzinfo, "localize") else parsed.replace(tzinfo=tzinfo)
+    return parsed
+
+
+def event_days(event, tzinfo=None):
+    """
+    Return the set of YYYY-MM-DD dates an event touches.
+    """
+    if "start" not in event or "end" not in event:
+        return set()
+    start = parse_event_time(event["start"], tzinfo)
+    end = parse_event_time(event["end"], tzinfo)
+    if start is None or end is None:
+        return set()
+    if tzinfo is not None:
+        start = start.astimezone(tzinfo)
+        end = end.astimezone(tzinfo)
+
+    days = set()
+    current = start.date()
+    # An event ending exactly at midnight does not occupy the next day
+    last = (end - timedelta(microseconds=1)).date() if end > start else start.date()
+    while current <= last:
+        days.add(current.isoformat())
+        current += timedelta(days=1)
+    return days
+
+
+class CalendarEventStore:
+    """
+    Local copy of the events of watched calendars.
+
+    Each calendar is filled by a full sync over a time window and then kept
+    current with incremental (syncToken) fetches triggered by push notifications,
+    so busy-time lookups inside that window don't need to call `events().list`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = {}       # calendar_id -> {event_id: event}
+        self._sync_tokens = {}  # calendar_id -> nextSyncToken
+        self._windows = {}      # calendar_id -> (start_time, end_time)
+
+    def replace(self, calendar_id, events, sync_token, start_time, end_time):
+        """
+        Replace everything known about a calendar with the result of a full sync.
+        """
+        with self._lock:
+            self._events[calendar_id] = {
+                event["id"]: event for event in events if event.get("status") != "cancelled"
+            }
+            self._sync_tokens[calendar_id] = sync_token
+            self._windows[calendar_id] = (start_time, end_time)
+
+    def apply_delta(self, calendar_id, events, sync_token):
+        """
+        Merge the result of an incremental fetch. Cancelled events are removed.
+
+        Returns:
+            list: The previous and new versions of every changed event, so callers
+            can tell which days were affected.
+        """
+        touched = []
+        with self._lock:
+            known = self._events.setdefault(calendar_id, {})
+            for event in events:
+                previous = known.pop(event["id"], None)
+                if previous is not None:
+                    touched.append(previous)
+                if event.get("status") != "cancelled":
+                    known[event["id"]] = event
+                    touched.append(event)
+            if sync_token:
+                self._sync_tokens[calendar_id] = sync_token
+        return touched
+
+    def covers(self, calendar_id, start_time, end_time):
+        """
+        Whether the store can answer a query for `calendar_id` over the given range.
+        """
+        with self._lock:
+            window = self._windows.get(calendar_id)
+            if window is None or calendar_id not in self._sync_tokens:
+                return False
+            return window[0] <= start_time and end_time <= window[1]
+
+    def events(self, calendar_id, start_time, end_time):
+        """
+        Return stored events of a calendar that overlap [start_time, end_time), ordered by start.
+        """
+        with self._lock:
+            candidates = list(self._events.get(calendar_id, {}).values())
+
+        tzinfo = start_time.tzinfo
+        matching = []
+        for event in candidates:
+            if "start" not in event or "end" not in event:
+                continue
+            event_start = parse_event_time(event["start"], tzinfo)
+            event_end = parse_event_time(event["end"], tzinfo)
+            if event_start < end_time and event_end > start_time:
+                matching.append((event_start, event))
+        matching.sort(key=lambda pair: pair[0])
+        return [event for _, event in matching]
+
+    def sync_token(self, calendar_id):
+        with self._lock:
+            return self._sync_tokens.get(calendar_id)
+
+    def window(self, calendar_id):
+        with self._lock:
+            return self._windows.get(calendar_id)
+
+    def drop(self, calendar_id):
+        with self._lock:
+            self._events.pop(calendar_id, None)
+            self._sync_tokens.pop(calendar_id, None)
+            self._windows.pop(calendar_id, None)
+
+
+class ChannelRegistry:
+    """
+    Active `events.watch` notification channels, keyed by channel ID.
+
+    Channels are plain dicts with "id", "resourceId", "calendarId", "token",
+    "address" and "expiration" (a timezone-aware datetime).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}
+
+    def add(self, channel):
+        with self._lock:
+            self._channels[channel["id"]] = channel
+
+    def get(self, channel_id):
+        with self._lock:
+            return self._channels.get(channel_id)
+
+    def remove(self, channel_id):
+        with self._lock:
+            return self._channels.pop(channel_id, None)
+
+    def all(self):
+        with self._lock:
+            return list(self._channels.values())
+
+    def for_calendar(self, calendar_id):
+        with self._lock:
+            return [c for c in self._channels.values() if c["calendarId"] == calendar_id]
+
+    def expiring(self, now, margin):
+        """
+        Return channels that expire within `margin` (a timedelta) of `now`.
+        """
+        with self._lock:
+            return [c for c in self._channels.values() if c["expiration"] - margin <= now]
+
+
+class DirtyDays:
+    """
+    Schedule days whose busy times changed since the last reschedule.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._days = set()
+
+    def mark(self, days):
+        with self._lock:
+            self._days.update(days)
+
+    def snapshot(self):
+        with self._lock:
+            return sorted(self._days)
+
+    def discard(self, days):
+        """
+        Unmark days that a finished reschedule has taken into account.
+        """
+        with self._lock:
+            self._days.difference_update(days)
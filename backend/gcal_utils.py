@@ -2,7 +2,16 @@
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from datetime import datetime, timedelta
+from gcal_sync import CalendarEventStore, ChannelRegistry, DirtyDays, event_days, parse_event_time
+from app.resilience import UpstreamUnavailable, record_fallback, resilient_call, status_code_of
+from app.shared_cache import get_shared_cache
+import httplib2
+import os
+import secrets
+import threading
+import uuid
 import pytz
 
 # Google Calendar API Setup
@@ -11,6 +20,34 @@ SERVICE_ACCOUNT_FILE = "./smart-calendar.json"  # Update this path
 credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
 service = build('calendar', 'v3', credentials=credentials)
 
+# Push-notification state: events of watched calendars, their channels, and
+# the schedule days touched by calendar changes since the last reschedule
+event_store = CalendarEventStore()
+watch_channels = ChannelRegistry()
+dirty_days = DirtyDays()
+
+WATCH_TTL_SECONDS = 7 * 24 * 60 * 60  # Google caps events.watch channels at about a week
+WATCH_SYNC_DAYS = 30  # How far ahead the local copy of a watched calendar reaches
+
+GCAL_DEADLINE_SECONDS = 20  # Total time allowed per Calendar request, retries included
+
+# Calendar the app writes task events to
+TASK_CALENDAR_ID = '18e35445374afb9fd5e35bc56cece6508da0d1a224aa1280944cfc8261e6f8d8@group.calendar.google.com'
+
+# Partial-response mask for events().list: only what busy times and syncing need
+EVENT_FIELDS = "items(id,status,start,end,creator/email),nextPageToken,nextSyncToken"
+FREEBUSY_MAX_CALENDARS = 50  # Calendars per freebusy().query request
+
+# Busy intervals of the last successful fetch and the range they cover, served
+# when Calendar is unavailable so a failed fetch isn't mistaken for a free calendar
+BUSY_TIMES_MAX_STALENESS = timedelta(hours=6)
+_busy_times_fallback = {"fetched_at": None, "start_time": None, "end_time": None, "busy_times": []}
+
+# Calendars shared with the service account change rarely, so their list is
+# kept for a while instead of being fetched with every busy-time read
+CALENDAR_IDS_MAX_AGE = timedelta(minutes=15)
+_calendar_ids = {"fetched_at": None, "calendar_ids": []}
+
 def get_local_time():
     """
     Get the current local time in America/New_York timezone.
@@ -18,96 +55,460 @@ def get_local_time():
     local_tz = pytz.timezone("America/New_York")
     return datetime.now(local_tz)
 
-def get_all_events(start_time, end_time):
+_http_local = threading.local()
+
+
+def attempt_http(timeout):
+    """
+    This thread's authorized HTTP client, with its socket timeout set for the
+    next attempt. httplib2 clients aren't thread-safe, and keeping one per
+    thread keeps its connections alive between requests.
+    """
+    http = getattr(_http_local, "http", None)
+    if http is None:
+        http = _http_local.http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=timeout))
+    http.http.timeout = timeout
+    for connection in http.http.connections.values():
+        connection.timeout = timeout
+        if getattr(connection, "sock", None) is not None:
+            connection.sock.settimeout(timeout)
+    return http
+
+
+def execute(request, deadline=GCAL_DEADLINE_SECONDS, idempotent=True):
+    """
+    Execute a Calendar API request with retries, backoff and the "gcal" circuit breaker.
+    Each attempt may take at most what is left of the deadline.
+    """
+    return resilient_call(
+        "gcal",
+        lambda timeout: request.execute(http=attempt_http(timeout)),
+        deadline=deadline,
+        pass_timeout=True,
+        idempotent=idempotent,
+    )
+
+def event_store_is_current():
+    """
+    Whether this process's copy of the watched calendars can answer reads.
+
+    Channels and their copies live in the process that opened them, but a
+    notification reaches whichever worker the load balancer picks. With
+    several workers (WEB_CONCURRENCY > 1, as read by uvicorn and gunicorn)
+    the copy can miss changes, so calendars are polled instead.
+    """
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1")) <= 1
+    except ValueError:
+        return False
+
+def list_calendar_ids():
+    """
+    IDs of all calendars the service account has access to, fetched at most
+    every CALENDAR_IDS_MAX_AGE.
+    """
+    fetched_at = _calendar_ids["fetched_at"]
+    if fetched_at is not None and get_local_time() - fetched_at < CALENDAR_IDS_MAX_AGE:
+        return list(_calendar_ids["calendar_ids"])
+
+    calendars = execute(service.calendarList().list(fields="items(id)"))
+    calendar_ids = [calendar['id'] for calendar in calendars.get('items', [])]
+    _calendar_ids.update(fetched_at=get_local_time(), calendar_ids=calendar_ids)
+    return list(calendar_ids)
+
+def get_all_events(start_time, end_time, calendar_ids=None):
     """
     Fetch all events from Google Calendar across all accessible calendars
-    within a specified time range.
+    (or only `calendar_ids`) within a specified time range.
+
+    Errors are raised rather than returning an empty list, which would look
+    like a calendar without any events.
+    """
+    # List all calendars the user has access to
+    if calendar_ids is None:
+        calendar_ids = list_calendar_ids()
+
+    # Fetch events from all calendars within the given time range
+    all_events = []
+    use_event_store = event_store_is_current()
+    for calendar_id in calendar_ids:
+        # Watched calendars are kept current by push notifications, no need to poll them
+        if use_event_store and event_store.covers(calendar_id, start_time, end_time):
+            for event in event_store.events(calendar_id, start_time, end_time):
+                all_events.append(dict(event, calendarId=calendar_id))
+            continue
+
+        events_result = execute(service.events().list(
+            calendarId=calendar_id,
+            timeMin=start_time.isoformat(),
+            timeMax=end_time.isoformat(),
+            singleEvents=True,
+            orderBy="startTime",
+            fields=EVENT_FIELDS
+        ))
+        events = events_result.get('items', [])
+        for event in events:
+            event["calendarId"] = calendar_id  # Tag the event with its calendar ID
+            all_events.append(event)
+
+    return all_events
+
+def full_sync_calendar(calendar_id, start_time, end_time):
+    """
+    Download every event of a calendar in the given range and store it together
+    with the sync token needed for later incremental fetches.
+    """
+    events = []
+    page_token = None
+    while True:
+        events_result = execute(service.events().list(
+            calendarId=calendar_id,
+            timeMin=start_time.isoformat(),
+            timeMax=end_time.isoformat(),
+            singleEvents=True,
+            pageToken=page_token,
+            fields=EVENT_FIELDS
+        ))
+        events.extend(events_result.get('items', []))
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            break
+
+    event_store.replace(calendar_id, events, events_result.get('nextSyncToken'), start_time, end_time)
+    return events
+
+
+def sync_calendar_delta(calendar_id):
     """
+    Fetch only the events that changed since the last sync of a watched calendar.
+    Falls back to a full sync when Google invalidates the sync token (410 Gone).
+
+    Returns:
+        list: Previous and new versions of the changed events.
+    """
+    window = event_store.window(calendar_id)
+    sync_token = event_store.sync_token(calendar_id)
+    if window is None or not sync_token:
+        start_time = get_local_time()
+        full_sync_calendar(calendar_id, start_time, start_time + timedelta(days=WATCH_SYNC_DAYS))
+        return []
+
+    changed = []
+    page_token = None
     try:
-        # List all calendars the user has access to
-        calendars = service.calendarList().list().execute()
-        calendar_ids = [calendar['id'] for calendar in calendars.get('items', [])]
-
-        # Fetch events from all calendars within the given time range
-        all_events = []
-        for calendar_id in calendar_ids:
-            events_result = service.events().list(
+        while True:
+            events_result = execute(service.events().list(
                 calendarId=calendar_id,
-                timeMin=start_time.isoformat(),
-                timeMax=end_time.isoformat(),
+                syncToken=sync_token,
                 singleEvents=True,
-                orderBy="startTime"
-            ).execute()
-            events = events_result.get('items', [])
-            for event in events:
-                event["calendarId"] = calendar_id  # Tag the event with its calendar ID
-                all_events.append(event)
-
-        return all_events
+                pageToken=page_token,
+                fields=EVENT_FIELDS
+            ))
+            changed.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
     except HttpError as error:
-        print(f"An error occurred: {error}")
+        if error.resp.status != 410:
+            raise
+        print(f"Sync token expired for {calendar_id}, running a full sync")
+        full_sync_calendar(calendar_id, *window)
         return []
 
-def get_all_events_by_user(start_time, end_time, user_email):
+    return event_store.apply_delta(calendar_id, changed, events_result.get('nextSyncToken'))
+
+
+def watch_calendar(calendar_id, address=None, ttl_seconds=WATCH_TTL_SECONDS, token=None):
     """
-    Fetch all events that the user didn't create.
+    Open an `events.watch` push channel for a calendar and sync its events locally.
+
+    Args:
+        calendar_id (str): Calendar to watch.
+        address (str): HTTPS URL of the notification webhook. Defaults to GCAL_WEBHOOK_URL.
+        ttl_seconds (int): Requested channel lifetime.
+        token (str): Verification token echoed back in notifications. Random if not given.
+
+    Returns:
+        dict: The registered channel.
+    """
+    address = address or os.getenv("GCAL_WEBHOOK_URL")
+    if not address:
+        raise ValueError("No webhook address configured (set GCAL_WEBHOOK_URL).")
+
+    # Fill the local copy first so notifications only ever need delta fetches
+    if event_store.window(calendar_id) is None:
+        start_time = get_local_time()
+        full_sync_calendar(calendar_id, start_time, start_time + timedelta(days=WATCH_SYNC_DAYS))
+
+    token = token or secrets.token_urlsafe(24)
+    # Not retried once it may have reached Google: a second channel would be opened
+    response = execute(service.events().watch(
+        calendarId=calendar_id,
+        body={
+            'id': str(uuid.uuid4()),
+            'type': 'web_hook',
+            'address': address,
+            'token': token,
+            'params': {'ttl': str(ttl_seconds)},
+        }
+    ), idempotent=False)
+
+    channel = {
+        "id": response["id"],
+        "resourceId": response["resourceId"],
+        "calendarId": calendar_id,
+        "token": token,
+        "address": address,
+        "expiration": datetime.fromtimestamp(int(response["expiration"]) / 1000, tz=pytz.utc),
+    }
+    watch_channels.add(channel)
+    print(f"Watching calendar {calendar_id} on channel {channel['id']} until {channel['expiration']}")
+    return channel
+
+
+def stop_watch(channel_id):
+    """
+    Stop a push channel. The local copy of the calendar is dropped once no
+    channel watches it anymore.
     """
+    channel = watch_channels.remove(channel_id)
+    if not channel:
+        return False
     try:
-        # Fetch all events within the given time range
-        all_events = get_all_events(start_time, end_time)
-
-        # Filter events not created by the user
-        immutable_events = []
-        for event in all_events:
-            # Check if the event was not created by the user
-            if "creator" in event and event["creator"]["email"] != user_email:
-                immutable_events.append(event)
-
-        return immutable_events
-    except Exception as error:
-        print(f"An error occurred while fetching immutable events: {error}")
+        execute(service.channels().stop(body={'id': channel["id"], 'resourceId': channel["resourceId"]}))
+    except (HttpError, UpstreamUnavailable) as error:
+        print(f"An error occurred while stopping channel {channel_id}: {error}")
+    if not watch_channels.for_calendar(channel["calendarId"]):
+        event_store.drop(channel["calendarId"])
+    return True
+
+
+def renew_expiring_channels(margin=timedelta(hours=12)):
+    """
+    Replace channels that are about to expire. The new channel is opened before
+    the old one is stopped so no notification is missed in between. The local
+    copy is re-synced so its window keeps moving forward.
+    """
+    renewed = []
+    for channel in watch_channels.expiring(datetime.now(pytz.utc), margin):
+        try:
+            start_time = get_local_time()
+            full_sync_calendar(channel["calendarId"], start_time, start_time + timedelta(days=WATCH_SYNC_DAYS))
+            renewed.append(watch_calendar(channel["calendarId"], channel["address"], token=channel["token"]))
+            stop_watch(channel["id"])
+        except Exception as error:
+            print(f"Failed to renew channel {channel['id']}: {error}")
+    return renewed
+
+
+def handle_push_notification(channel_id, token, resource_state, mark_dirty=True):
+    """
+    Process an `events.watch` notification: fetch only the changes of the
+    notified calendar and, optionally, mark the schedule days they touch as dirty.
+
+    Returns:
+        list: Sorted dates affected by the change.
+    """
+    channel = watch_channels.get(channel_id)
+    if not channel or not secrets.compare_digest(channel["token"], token or ""):
+        raise PermissionError(f"Unknown channel or bad token: {channel_id}")
+
+    # "sync" is the handshake sent when a channel is created, nothing changed yet
+    if resource_state == "sync":
+        return []
+
+    changed = sync_calendar_delta(channel["calendarId"])
+    days = set()
+    for event in changed:
+        days |= event_days(event, pytz.timezone("America/New_York"))
+    if changed:
+        get_shared_cache().invalidate("busy_times")  # For all workers, not only the one notified
+    if mark_dirty:
+        dirty_days.mark(days)
+    return sorted(days)
+
+
+def get_all_events_by_user(start_time, end_time, user_email, calendar_ids=None):
+    """
+    Fetch all events that the user didn't create.
+    """
+    # Fetch all events within the given time range
+    all_events = get_all_events(start_time, end_time, calendar_ids)
+
+    # Filter events not created by the user
+    immutable_events = []
+    for event in all_events:
+        # Check if the event was not created by the user
+        if "creator" in event and event["creator"]["email"] != user_email:
+            immutable_events.append(event)
+
+    return immutable_events
+
+
+def get_freebusy_intervals(start_time, end_time, calendar_ids):
+    """
+    Busy intervals of the given calendars from `freebusy().query`: one request
+    per 50 calendars, returning only start/end pairs instead of full events.
+    """
+    busy_times = []
+    for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+        chunk = calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS]
+        result = execute(service.freebusy().query(body={
+            'timeMin': start_time.isoformat(),
+            'timeMax': end_time.isoformat(),
+            'items': [{'id': calendar_id} for calendar_id in chunk],
+        }))
+        for calendar_id, calendar in result.get('calendars', {}).items():
+            if calendar.get('errors'):
+                print(f"Freebusy error for calendar {calendar_id}: {calendar['errors']}")
+                continue
+            busy_times.extend({"start": busy["start"], "end": busy["end"]} for busy in calendar.get('busy', []))
+    return busy_times
+
+
+def get_event_busy_times(start_time, end_time, calendar_ids=None):
+    """
+    Busy intervals from the events the user didn't create, listed per calendar.
+    """
+    busy_times = []
+    for event in get_all_events_by_user(start_time, end_time, "hanlyu2005@gmail.com", calendar_ids):
+        if "start" in event and "end" in event:
+            busy_times.append({
+                "start": event["start"].get("dateTime", event["start"].get("date")),
+                "end": event["end"].get("dateTime", event["end"].get("date"))
+            })
+    return busy_times
+
+
+def get_cached_busy_times(start_time, end_time):
+    """
+    Busy intervals from the last successful Calendar fetch that overlap the range.
+
+    Raises:
+        UpstreamUnavailable: Nothing recent enough is cached, or the last fetch
+            doesn't cover the whole range (the rest would look free).
+    """
+    fetched_at = _busy_times_fallback["fetched_at"]
+    if fetched_at is None or get_local_time() - fetched_at > BUSY_TIMES_MAX_STALENESS:
+        raise UpstreamUnavailable("gcal", "Calendar unavailable and no recent busy times cached")
+    if not (_busy_times_fallback["start_time"] <= start_time and end_time <= _busy_times_fallback["end_time"]):
+        raise UpstreamUnavailable(
+            "gcal",
+            f"Calendar unavailable and the cached busy times only cover "
+            f"{_busy_times_fallback['start_time']} to {_busy_times_fallback['end_time']}",
+        )
+
+    record_fallback("gcal")
+    print(f"Calendar unavailable, using busy times fetched at {fetched_at}")
+    return overlapping_busy_times(_busy_times_fallback["busy_times"], start_time, end_time)
+
+
+def overlapping_busy_times(busy_times, start_time, end_time):
+    """
+    Busy intervals (ISO strings) that overlap the range.
+    """
+    tzinfo = start_time.tzinfo
+    return [
+        busy for busy in busy_times
+        if parse_event_time({"dateTime": busy["start"]}, tzinfo) < end_time
+        and parse_event_time({"dateTime": busy["end"]}, tzinfo) > start_time
+    ]
+
+
+def watched_calendar_ids(start_time, end_time):
+    """
+    Watched calendars whose local copy can answer for the range, sorted.
+    """
+    if not event_store_is_current():
         return []
+    calendar_ids = {channel["calendarId"] for channel in watch_channels.all()}
+    return sorted(c for c in calendar_ids if event_store.covers(c, start_time, end_time))
+
+
+def fetch_calendar_busy_times(start_time, end_time):
+    """
+    Busy intervals of the calendars from the backend picked by GCAL_BUSY_BACKEND,
+    through the shared cache when it is enabled (see app/shared_cache.py).
+
+    Cached entries cover whole days, so runs starting at different times of a
+    day share them; they are dropped when a watched calendar changes. Watched
+    calendars are read from their local copy over the exact range instead:
+    it starts at the last sync, so it can't answer for whole days.
+    """
+    backend = os.getenv("GCAL_BUSY_BACKEND", "events").lower()
+
+    def fetch(fetch_start, fetch_end, skipped=()):
+        calendar_ids = [c for c in list_calendar_ids() if c not in skipped]
+        if backend == "freebusy":
+            calendar_ids = [c for c in calendar_ids if c != TASK_CALENDAR_ID]
+            return get_freebusy_intervals(fetch_start, fetch_end, calendar_ids)
+        return get_event_busy_times(fetch_start, fetch_end, calendar_ids)
+
+    cache = get_shared_cache()
+    if not cache.enabled:
+        return fetch(start_time, end_time)
+
+    watched = [] if backend == "freebusy" else watched_calendar_ids(start_time, end_time)
+    tz = pytz.timezone("America/New_York")
+    day_start = tz.localize(datetime.combine(start_time.astimezone(tz).date(), datetime.min.time()))
+    day_end = tz.localize(datetime.combine(end_time.astimezone(tz).date() + timedelta(days=1), datetime.min.time()))
+    busy_times = cache.get_or_compute(
+        "busy_times",
+        f"{backend}:{','.join(watched)}:{day_start.isoformat()}:{day_end.isoformat()}",
+        lambda: fetch(day_start, day_end, watched),
+    )
+    busy_times = overlapping_busy_times(busy_times, start_time, end_time)
+    if watched:
+        busy_times += get_event_busy_times(start_time, end_time, watched)
+    return busy_times
 
 
 def get_busy_times(start_time, end_time):
     """
     Query Google Calendar to retrieve busy slots based on immutable events
     (i.e., events the user didn't create) and include times between 10 PM and 8 AM as busy.
+
+    GCAL_BUSY_BACKEND picks how calendar busy times are fetched:
+    - "events" (default): events().list per calendar with a partial-response mask,
+      ignoring events the user created.
+    - "freebusy": a single freebusy().query over all calendars except the task
+      calendar. Much smaller responses, but every event counts as busy, including
+      the user's own.
+
+    Busy intervals are shared between workers through the shared cache, if enabled.
+    If Calendar can't be reached, recently fetched busy times are used instead.
+
+    Raises:
+        UpstreamUnavailable: Calendar is unavailable and nothing recent is cached.
     """
     try:
-        # Step 1: Get all immutable events (events the user didn't create)
-        immutable_events = get_all_events_by_user(start_time, end_time, "hanlyu2005@gmail.com")
-
-        # Step 2: Extract busy times from immutable events
-        busy_times = []
-        for event in immutable_events:
-            if "start" in event and "end" in event:
-                busy_times.append({
-                    "start": event["start"].get("dateTime", event["start"].get("date")),
-                    "end": event["end"].get("dateTime", event["end"].get("date"))
-                })
-
-        # Step 3: Add nighttime (10 PM - 8 AM) as busy
-        current_day = start_time
-        while current_day < end_time:
-            # Define nighttime range for the current day
-            night_start = current_day.replace(hour=22, minute=0, second=0, microsecond=0)  # 10 PM
-            night_end = (current_day + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)  # 8 AM next day
-
-            # Only include nighttime if it falls within the start_time and end_time range
-            if night_start < end_time and night_end > start_time:
-                busy_times.append({
-                    "start": max(night_start.isoformat(), start_time.isoformat()),
-                    "end": min(night_end.isoformat(), end_time.isoformat())
-                })
-
-            # Move to the next day
-            current_day += timedelta(days=1)
-
-        return busy_times
-    except Exception as error:
+        # Step 1-2: Get busy intervals from the calendars
+        busy_times = fetch_calendar_busy_times(start_time, end_time)
+        _busy_times_fallback.update(
+            fetched_at=get_local_time(), start_time=start_time, end_time=end_time, busy_times=list(busy_times)
+        )
+    except (UpstreamUnavailable, HttpError) as error:
         print(f"An error occurred in get_busy_times: {error}")
-        return []
+        busy_times = get_cached_busy_times(start_time, end_time)
+
+    # Step 3: Add nighttime (10 PM - 8 AM) as busy
+    current_day = start_time
+    while current_day < end_time:
+        # Define nighttime range for the current day
+        night_start = current_day.replace(hour=22, minute=0, second=0, microsecond=0)  # 10 PM
+        night_end = (current_day + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)  # 8 AM next day
+
+        # Only include nighttime if it falls within the start_time and end_time range
+        if night_start < end_time and night_end > start_time:
+            busy_times.append({
+                "start": max(night_start.isoformat(), start_time.isoformat()),
+                "end": min(night_end.isoformat(), end_time.isoformat())
+            })
+
+        # Move to the next day
+        current_day += timedelta(days=1)
+
+    return busy_times
 
 
 def create_gcal_event(task, start_time, end_time):
@@ -115,8 +516,12 @@ def create_gcal_event(task, start_time, end_time):
     Create a Google Calendar event for the given task.
     """
     try:
-        calendar_id = '18e35445374afb9fd5e35bc56cece6508da0d1a224aa1280944cfc8261e6f8d8@group.calendar.google.com'
+        calendar_id = TASK_CALENDAR_ID
+        # Client-chosen id (base32hex): a retried insert the server already
+        # committed fails with 409 instead of creating a duplicate event
+        event_id = uuid.uuid4().hex
         event_body = {
+            'id': event_id,
             'summary': task["name"],
             'description': f"Priority: {task.get('priority', 'Low')}\nTask Type: {task.get('taskType', '')}\nNotes: {task.get('notes', '')}",
             'start': {
@@ -129,10 +534,16 @@ def create_gcal_event(task, start_time, end_time):
             }
         }
         print("Task being scheduled:", task)
-        event = service.events().insert(calendarId=calendar_id, body=event_body).execute()
+        try:
+            event = execute(service.events().insert(calendarId=calendar_id, body=event_body))
+        except HttpError as error:
+            if status_code_of(error) != 409:
+                raise
+            # An earlier attempt went through
+            event = execute(service.events().get(calendarId=calendar_id, eventId=event_id))
         print("Event created:", event)
         return event
-    except HttpError as error:
+    except (HttpError, UpstreamUnavailable) as error:
         print(f"An error occurred: {error}")
         return None
 
@@ -140,11 +551,16 @@ def delete_gcal_event(event_id):
     """
     Delete a Google Calendar event by its event ID.
     """
-    calendar_id = '18e35445374afb9fd5e35bc56cece6508da0d1a224aa1280944cfc8261e6f8d8@group.calendar.google.com'
+    calendar_id = TASK_CALENDAR_ID
     try:
-        service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+        execute(service.events().delete(calendarId=calendar_id, eventId=event_id))
         return True
     except HttpError as error:
+        if status_code_of(error) in (404, 410):
+            return True  # Already gone, e.g. deleted by an attempt whose response was lost
+        print(f"An error occurred while deleting event: {error}")
+        return False
+    except UpstreamUnavailable as error:
         print(f"An error occurred while deleting event: {error}")
         return False
 
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import unittest
+
+
+class TestScheduleWrites(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+        import httpx
+        from benchmarks.fakes import install_fakes
+        cls.fakes = install_fakes()
+        import app.routes.todos as todos_module
+        from gcal_utils import TASK_CALENDAR_ID
+        cls.todos = todos_module
+        cls.task_calendar = TASK_CALENDAR_ID
+        cls.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=cls.fakes.app), base_url="http://test")
+
+    def seed(self, *todo_ids):
+        snapshot = []
+        for todo_id in todo_ids:
+            todo = {"name": f"Task {todo_id}", "dueDate": "2030-05-02", "priority": "High", "estimatedTime": "1"}
+            self.fakes.db.collection("todos").document(todo_id).set(todo)
+            snapshot.append({**todo, "id": todo_id})
+        return snapshot
+
+    def schedule(self, *todo_ids):
+        return {"scheduled_tasks": [
+            {"task_id": todo_id, "start_time": f"2030-05-01T{9 + i:02d}:00:00", "end_time": f"2030-05-01T{9 + i:02d}:30:00"}
+            for i, todo_id in enumerate(todo_ids)
+        ]}
+
+    def task_events(self, todo_id):
+        events = self.fakes.calendar.events_by_calendar.get(self.task_calendar, {}).values()
+        return [event for event in events if event["summary"] == f"Task {todo_id}"]
+
+    def test_todo_deleted_during_scheduling(self):
+        snapshot = self.seed("apply-a", "apply-b")
+        self.fakes.db.collection("todos").document("apply-b").delete()
+
+        self.todos.apply_schedule(self.schedule("apply-a", "apply-b"), snapshot)
+
+        self.assertTrue(self.fakes.db.read("todos/apply-a")["gcalEventId"])
+        self.assertIsNone(self.fakes.db.read("todos/apply-b"))
+        self.assertEqual(self.task_events("apply-b"), [])
+        slots = self.fakes.db.read("calendar/2030-05-01")["slots"]
+        self.assertEqual([slot["task_id"] for slot in slots], ["apply-a"])
+
+    def test_edits_refresh_day_slot(self):
+        snapshot = self.seed("edit-a", "edit-b")
+        self.todos.apply_schedule(self.schedule("edit-a", "edit-b"), snapshot)
+
+        renamed = {"id": "edit-a", "name": "Renamed", "dueDate": "2030-05-02", "priority": "Low"}
+        response = asyncio.run(self.client.put("/api/todos/edit-a", json=renamed))
+        self.assertEqual(response.status_code, 200)
+        slots = {slot["task_id"]: slot for slot in self.fakes.db.read("calendar/2030-05-01")["slots"]}
+        self.assertEqual(slots["edit-a"]["name"], "Renamed")
+
+        # A bulk import overwriting edit-b drops its schedule: its slot and its event
+        self.assertEqual(len(self.task_events("edit-b")), 1)
+        body = b'{"id": "edit-b", "name": "Imported", "dueDate": "2030-05-03", "priority": "Low"}\n'
+        response = asyncio.run(self.client.post("/api/todos/bulk", content=body))
+        self.assertEqual((response.json()["created"], response.json()["updated"]), (0, 1))
+        slots = self.fakes.db.read("calendar/2030-05-01")["slots"]
+        self.assertNotIn("edit-b", [slot["task_id"] for slot in slots])
+        self.assertEqual(self.task_events("edit-b"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
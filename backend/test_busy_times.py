@@ -0,0 +1,135 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytz
+
+
+class TestBusyTimeBackends(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+        from benchmarks.fakes import install_fakes
+        cls.fakes = install_fakes()
+        import gcal_utils
+        cls.gcal = gcal_utils
+
+    def setUp(self):
+        calendar = self.fakes.calendar
+        saved = calendar.events_by_calendar
+        calendar.events_by_calendar = {"primary": {}, "work": {}, self.gcal.TASK_CALENDAR_ID: {}}
+        self.addCleanup(setattr, calendar, "events_by_calendar", saved)
+        # Each test has its own calendars, the listing of a previous one doesn't apply
+        patcher = patch.dict(self.gcal._calendar_ids, {"fetched_at": None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        tz = pytz.timezone("America/New_York")
+        self.start = tz.localize(datetime(2030, 7, 1, 8))
+        self.end = self.start + timedelta(days=2)
+        for calendar_id, hour in (("primary", 10), ("work", 14), ("work", 30)):
+            event_start = self.start + timedelta(hours=hour - 8)
+            calendar.add_event(calendar_id, event_start, event_start + timedelta(hours=1))
+
+    def busy_times(self, backend):
+        with patch.dict(os.environ, {"GCAL_BUSY_BACKEND": backend}):
+            return sorted(self.gcal.fetch_calendar_busy_times(self.start, self.end), key=lambda b: b["start"])
+
+    def test_backends_agree_on_others_events(self):
+        events = self.busy_times("events")
+        self.assertEqual(len(events), 3)
+        self.assertEqual(self.busy_times("freebusy"), events)
+
+    def test_freebusy_batches_and_skips_task_calendar_and_errors(self):
+        calendar = self.fakes.calendar
+        for i in range(110):
+            calendar.events_by_calendar[f"shared{i:03d}"] = {}
+        queries = []
+        answer = calendar._freebusy
+
+        def freebusy(body):
+            queries.append([item["id"] for item in body["items"]])
+            result = answer(body)
+            if "primary" in result["calendars"]:
+                result["calendars"]["primary"] = {"errors": [{"reason": "notFound"}], "busy": []}
+            return result
+
+        with patch.object(calendar, "_freebusy", freebusy):
+            busy = self.busy_times("freebusy")
+
+        self.assertEqual([len(ids) for ids in queries], [50, 50, 12])
+        queried = [calendar_id for ids in queries for calendar_id in ids]
+        self.assertNotIn(self.gcal.TASK_CALENDAR_ID, queried)
+        # The calendar that answered with errors is skipped, the others still count
+        self.assertEqual(len(busy), 2)
+
+    def test_event_store_only_answers_for_a_single_worker(self):
+        self.gcal.full_sync_calendar("work", self.start, self.end)
+        self.addCleanup(self.gcal.event_store.drop, "work")
+        # Changed after the sync, without a notification reaching this worker
+        added = self.start + timedelta(hours=4)
+        self.fakes.calendar.add_event("work", added, added + timedelta(hours=1))
+
+        with patch.dict(os.environ, {"WEB_CONCURRENCY": "1"}):
+            self.assertEqual(len(self.gcal.get_all_events(self.start, self.end)), 3)
+        with patch.dict(os.environ, {"WEB_CONCURRENCY": "4"}):
+            self.assertEqual(len(self.gcal.get_all_events(self.start, self.end)), 4)
+
+    def test_watched_calendars_skip_the_shared_cache(self):
+        from app.shared_cache import MemoryCache, SharedCache
+        gcal = self.gcal
+        gcal.full_sync_calendar("work", self.start, self.end)
+        gcal.watch_channels.add({"id": "work-channel", "calendarId": "work"})
+        self.addCleanup(gcal.event_store.drop, "work")
+        self.addCleanup(gcal.watch_channels.remove, "work-channel")
+        # Changed after the sync, without a notification
+        added = self.start + timedelta(hours=4)
+        self.fakes.calendar.add_event("work", added, added + timedelta(hours=1))
+
+        with patch.object(gcal, "get_shared_cache", return_value=SharedCache(MemoryCache())):
+            calls = self.fakes.calendar.calls
+            busy = self.busy_times("events")
+            # Listing the calendars, polling primary and the task calendar; work comes from its local copy
+            self.assertEqual(self.fakes.calendar.calls, calls + 3)
+            self.assertEqual(len(busy), 3)
+
+            calls = self.fakes.calendar.calls
+            self.assertEqual(self.busy_times("events"), busy)
+            self.assertEqual(self.fakes.calendar.calls, calls)
+
+    def test_calendar_list_is_reused(self):
+        calls = self.fakes.calendar.calls
+        self.busy_times("events")
+        self.busy_times("events")
+        # One listing, then primary, work and the task calendar polled by each fetch
+        self.assertEqual(self.fakes.calendar.calls, calls + 1 + 2 * 3)
+
+    def test_no_channels_with_several_workers(self):
+        import asyncio
+        from app.routes.calendar import start_channel_maintenance
+        env = {"GCAL_WEBHOOK_URL": "https://example.com/api/calendar/notifications",
+               "GCAL_WATCH_CALENDARS": "work", "WEB_CONCURRENCY": "4"}
+        calls = self.fakes.calendar.calls
+        with patch.dict(os.environ, env):
+            self.assertIsNone(asyncio.run(start_channel_maintenance()))
+        self.assertEqual(self.gcal.watch_channels.for_calendar("work"), [])
+        self.assertEqual(self.fakes.calendar.calls, calls)
+
+    def test_fallback_only_serves_the_range_it_fetched(self):
+        from app.resilience import UpstreamUnavailable
+        gcal = self.gcal
+        with patch.dict(gcal._busy_times_fallback):
+            fetched = gcal.get_busy_times(self.start, self.end)
+
+            down = UpstreamUnavailable("gcal", "circuit open")
+            with patch.object(gcal, "fetch_calendar_busy_times", side_effect=down):
+                self.assertEqual(len(gcal.get_busy_times(self.start, self.end)), len(fetched))
+                later = self.start + timedelta(hours=20)  # The 6 AM event of the second day, and its night
+                self.assertEqual(len(gcal.get_busy_times(later, self.end)), 2)
+                with self.assertRaises(UpstreamUnavailable):
+                    gcal.get_busy_times(later, self.end + timedelta(days=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
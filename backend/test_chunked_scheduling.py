@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from app.chunked_scheduling import find_conflicts, plan_chunks, schedule_in_chunks, split_free_times_by_day
+
+
+def make_input(task_count):
+    return {
+        "tasks": [
+            {"id": f"t{i}", "name": f"Task {i}", "estimated_time_hours": "1",
+             "due_date": f"2024-01-0{1 + i // 4} 00:00:00"}
+            for i in range(task_count)
+        ],
+        "free_times": [
+            {"start": f"2024-01-0{day} 09:00:00", "end": f"2024-01-0{day} 14:00:00"} for day in range(1, 5)
+        ],
+        "busy_times": [],
+        "context": {"timezone": "America/New_York", "start_date": "2024-01-01", "end_date": "2024-01-04",
+                    "user_profile": {}},
+    }
+
+
+class TestChunkedScheduling(unittest.TestCase):
+
+    def test_free_times_split_at_midnight(self):
+        by_day = split_free_times_by_day([{"start": "2024-01-01 20:00:00", "end": "2024-01-02 02:00:00"}])
+        self.assertEqual(by_day["2024-01-01"], [{"start": "2024-01-01 20:00:00", "end": "2024-01-02 00:00:00"}])
+        self.assertEqual(by_day["2024-01-02"], [{"start": "2024-01-02 00:00:00", "end": "2024-01-02 02:00:00"}])
+
+    def test_chunks_respect_capacity_and_size(self):
+        chunks = plan_chunks(make_input(16), max_tasks_per_chunk=8)
+        # 4 usable hours a day (80% of 5), so 4 one-hour tasks per day, two days per chunk
+        self.assertEqual([chunk["days"] for chunk in chunks],
+                         [["2024-01-01", "2024-01-02"], ["2024-01-03", "2024-01-04"]])
+        self.assertEqual(sum(len(chunk["tasks"]) for chunk in chunks), 16)
+
+    def test_conflicts(self):
+        free_times = [{"start": "2024-01-01 09:00:00", "end": "2024-01-01 12:00:00"}]
+        scheduled = [
+            {"task_id": "a", "start_time": "2024-01-01T09:00:00", "end_time": "2024-01-01T10:00:00"},
+            {"task_id": "b", "start_time": "2024-01-01T09:30:00", "end_time": "2024-01-01T10:30:00"},  # overlaps a
+            {"task_id": "c", "start_time": "2024-01-01T11:00:00", "end_time": "2024-01-01T13:00:00"},  # past free time
+            {"task_id": "d", "start_time": "2024-01-01T15:00:00-05:00", "end_time": "nonsense"},
+        ]
+        conflicts = find_conflicts(scheduled, free_times, "America/New_York")
+        self.assertEqual([entry["task_id"] for entry in conflicts], ["b", "c", "d"])
+
+    def test_failed_and_conflicting_chunks_are_repaired(self):
+        gpt_input = make_input(16)
+        calls = []
+
+        async def schedule_chunk(chunk_input):
+            calls.append(chunk_input["context"]["start_date"])
+            if chunk_input["context"]["start_date"] == "2024-01-03":
+                raise RuntimeError("model unavailable")
+            # Every task of the chunk at the same time: all but the first conflict
+            return {
+                "scheduled_tasks": [
+                    {"task_id": task["id"], "start_time": "2024-01-01T09:00:00", "end_time": "2024-01-01T10:00:00"}
+                    for task in chunk_input["tasks"]
+                ],
+                "reasoning": "stacked",
+                "today": "Go!",
+            }
+
+        output = asyncio.run(schedule_in_chunks(gpt_input, schedule_chunk, max_tasks_per_chunk=8))
+
+        self.assertEqual(sorted(calls), ["2024-01-01", "2024-01-03"])
+        self.assertEqual(output["today"], "Go!")
+        self.assertEqual(find_conflicts(output["scheduled_tasks"], gpt_input["free_times"], "America/New_York"), [])
+        self.assertEqual(len({entry["task_id"] for entry in output["scheduled_tasks"]}), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from app.day_schedule import build_day_documents, remove_task_from_day, update_task_slot
+
+
+class TestDaySchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.todos = [
+            {"id": "a", "name": "Essay", "priority": "High", "dueDate": "2024-01-05",
+             "scheduledDate": "2024-01-02", "timeSlot": "09:00:00 - 11:00:00"},
+            {"id": "b", "name": "Reading", "priority": "Low", "dueDate": "2024-01-06",
+             "scheduledDate": "2024-01-03", "timeSlot": "14:00:00 - 15:00:00"},
+            {"id": "c", "name": "Lab", "priority": "Medium", "dueDate": "2024-01-04"},
+        ]
+
+    def test_moved_and_new_tasks(self):
+        updates = {
+            "a": {"scheduledDate": "2024-01-03", "timeSlot": "10:00:00 - 12:00:00", "gcalEventId": "e1"},
+            "c": {"scheduledDate": "2024-01-03", "timeSlot": "08:00:00 - 09:00:00", "gcalEventId": "e2"},
+        }
+
+        documents = build_day_documents(self.todos, updates, "2024-01-01T12:00:00")
+
+        # The essay left the 2nd, which is now empty
+        self.assertEqual(documents["2024-01-02"]["slots"], [])
+        # The 3rd keeps the untouched reading task, ordered by time
+        slots = documents["2024-01-03"]["slots"]
+        self.assertEqual([slot["task_id"] for slot in slots], ["c", "a", "b"])
+        self.assertEqual(slots[1]["gcalEventId"], "e1")
+        self.assertEqual(set(documents), {"2024-01-02", "2024-01-03"})
+
+    def test_remove_task(self):
+        documents = build_day_documents(
+            self.todos, {"a": {"scheduledDate": "2024-01-03", "timeSlot": "10:00:00 - 12:00:00"}}, "t1"
+        )
+        day = remove_task_from_day(documents["2024-01-03"], "b", "t2")
+        self.assertEqual([slot["task_id"] for slot in day["slots"]], ["a"])
+        self.assertEqual(day["updatedAt"], "t2")
+
+    def test_update_task_slot(self):
+        documents = build_day_documents(
+            self.todos, {"c": {"scheduledDate": "2024-01-03", "timeSlot": "16:00:00 - 17:00:00"}},
+            "2024-01-01T12:00:00",
+        )
+        day = documents["2024-01-03"]
+
+        renamed = {**self.todos[1], "name": "Reading (ch. 2)"}
+        updated = update_task_slot(day, "b", renamed, "2024-01-01T13:00:00")
+        self.assertEqual([slot["name"] for slot in updated["slots"]], ["Reading (ch. 2)", "Lab"])
+
+        # Overwritten without a schedule: the slot goes
+        unscheduled = {"id": "b", "name": "Reading", "priority": "Low", "dueDate": "2024-01-06"}
+        updated = update_task_slot(day, "b", unscheduled, "2024-01-01T13:00:00")
+        self.assertEqual([slot["task_id"] for slot in updated["slots"]], ["c"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from gcal_sync import CalendarEventStore, ChannelRegistry, DirtyDays, event_days
+
+
+def make_event(event_id, start, end, status="confirmed"):
+    return {"id": event_id, "status": status, "start": {"dateTime": start}, "end": {"dateTime": end}}
+
+
+class TestCalendarEventStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = CalendarEventStore()
+        self.window_start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.window_end = datetime(2024, 1, 31, tzinfo=timezone.utc)
+        self.store.replace(
+            "primary",
+            [
+                make_event("1", "2024-01-02T10:00:00Z", "2024-01-02T11:00:00Z"),
+                make_event("2", "2024-01-03T15:00:00Z", "2024-01-03T16:00:00Z"),
+            ],
+            "token-1",
+            self.window_start,
+            self.window_end,
+        )
+
+    def test_covers_only_synced_window(self):
+        self.assertTrue(self.store.covers("primary", self.window_start, self.window_end))
+        self.assertFalse(self.store.covers("primary", self.window_start, self.window_end + timedelta(days=1)))
+        self.assertFalse(self.store.covers("work", self.window_start, self.window_end))
+
+    def test_events_filtered_by_range(self):
+        events = self.store.events(
+            "primary", datetime(2024, 1, 3, tzinfo=timezone.utc), datetime(2024, 1, 4, tzinfo=timezone.utc)
+        )
+        self.assertEqual([event["id"] for event in events], ["2"])
+
+    def test_apply_delta_updates_and_cancels(self):
+        touched = self.store.apply_delta(
+            "primary",
+            [
+                make_event("1", "2024-01-05T10:00:00Z", "2024-01-05T11:00:00Z"),  # moved
+                {"id": "2", "status": "cancelled"},
+                make_event("3", "2024-01-06T09:00:00Z", "2024-01-06T10:00:00Z"),  # added
+            ],
+            "token-2",
+        )
+
+        self.assertEqual(self.store.sync_token("primary"), "token-2")
+        ids = [event["id"] for event in self.store.events("primary", self.window_start, self.window_end)]
+        self.assertEqual(ids, ["1", "3"])
+        # Old and new versions of event 1, the removed event 2 and the new event 3
+        self.assertEqual(len(touched), 4)
+
+        days = set()
+        for event in touched:
+            days |= event_days(event, timezone.utc)
+        self.assertEqual(days, {"2024-01-02", "2024-01-03", "2024-01-05", "2024-01-06"})
+
+
+class TestChannelsAndDirtyDays(unittest.TestCase):
+
+    def test_expiring_channels(self):
+        registry = ChannelRegistry()
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        registry.add({"id": "a", "calendarId": "primary", "expiration": now + timedelta(hours=1)})
+        registry.add({"id": "b", "calendarId": "primary", "expiration": now + timedelta(days=5)})
+
+        expiring = registry.expiring(now, timedelta(hours=12))
+        self.assertEqual([channel["id"] for channel in expiring], ["a"])
+
+    def test_discard_keeps_newer_days(self):
+        dirty = DirtyDays()
+        dirty.mark({"2024-01-02", "2024-01-03"})
+        seen = dirty.snapshot()
+        dirty.mark({"2024-01-04"})
+        dirty.discard(seen)
+        self.assertEqual(dirty.snapshot(), ["2024-01-04"])
+
+    def test_event_ending_at_midnight(self):
+        event = make_event("1", "2024-01-02T22:00:00+00:00", "2024-01-03T00:00:00+00:00")
+        self.assertEqual(event_days(event, timezone.utc), {"2024-01-02"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime
+from app.local_planner import free_time_blocks, merge_busy_times, plan_locally, parse_hours
+from app.model_routing import choose_route
+
+
+def make_input(tasks, free_times):
+    return {
+        "tasks": tasks,
+        "free_times": free_times,
+        "busy_times": [],
+        "context": {"start_date": "2024-01-01", "end_date": "2024-01-03"},
+    }
+
+
+class TestLocalPlanner(unittest.TestCase):
+
+    def test_tasks_fill_earliest_blocks(self):
+        gpt_input = make_input(
+            [
+                {"id": "a", "name": "Essay", "estimated_time_hours": "2"},
+                {"id": "b", "name": "Reading", "estimated_time_hours": "1"},
+                {"id": "c", "name": "Project", "estimated_time_hours": "5"},
+            ],
+            [
+                {"start": "2024-01-01 09:00:00", "end": "2024-01-01 12:00:00"},
+                {"start": "2024-01-02 09:00:00", "end": "2024-01-02 12:00:00"},
+            ],
+        )
+
+        output = plan_locally(gpt_input)
+        scheduled = {task["task_id"]: task for task in output["scheduled_tasks"]}
+
+        self.assertEqual(scheduled["a"]["start_time"], "2024-01-01T09:00:00")
+        self.assertEqual(scheduled["a"]["end_time"], "2024-01-01T11:00:00")
+        # The 15 minute break after the essay leaves only 45 minutes in the first block
+        self.assertEqual(scheduled["b"]["start_time"], "2024-01-02T09:00:00")
+        self.assertNotIn("c", scheduled)
+        self.assertIn("Project", output["reasoning"])
+
+    def test_night_blocks_after_events_stay_busy(self):
+        # get_busy_times lists calendar events first and the 22:00-08:00 nights last
+        busy_times = merge_busy_times([
+            {"start": datetime(2024, 1, 1, 10), "end": datetime(2024, 1, 1, 11)},
+            {"start": datetime(2024, 1, 2, 9), "end": datetime(2024, 1, 2, 10)},
+            {"start": datetime(2024, 1, 1, 22), "end": datetime(2024, 1, 2, 8)},
+            {"start": datetime(2024, 1, 2, 7), "end": datetime(2024, 1, 2, 8, 30)},
+        ])
+        free_times = free_time_blocks(busy_times, datetime(2024, 1, 1, 9), datetime(2024, 1, 2, 12))
+
+        self.assertEqual(free_times, [
+            {"start": "2024-01-01 09:00:00", "end": "2024-01-01 10:00:00"},
+            {"start": "2024-01-01 11:00:00", "end": "2024-01-01 22:00:00"},
+            {"start": "2024-01-02 08:30:00", "end": "2024-01-02 09:00:00"},
+            {"start": "2024-01-02 10:00:00", "end": "2024-01-02 12:00:00"},
+        ])
+
+        tasks = [{"id": str(i), "name": f"Task {i}", "estimated_time_hours": "2"} for i in range(6)]
+        output = plan_locally(make_input(tasks, free_times))
+        for entry in output["scheduled_tasks"]:
+            hour = datetime.fromisoformat(entry["start_time"]).hour
+            self.assertTrue(8 <= hour < 22, entry)
+
+    def test_parse_hours(self):
+        self.assertEqual(parse_hours("1.5"), 1.5)
+        self.assertEqual(parse_hours("2 hours"), 2.0)
+        self.assertEqual(parse_hours(None), 1.0)
+
+
+class TestModelRouting(unittest.TestCase):
+
+    def test_routes_by_problem_size(self):
+        free_times = [{"start": "2024-01-01 09:00:00", "end": "2024-01-01 12:00:00"}]
+        empty = choose_route(make_input([], free_times), "prompt")
+        few = choose_route(make_input([{"id": str(i)} for i in range(3)], free_times), "prompt")
+        small = choose_route(make_input([{"id": str(i)} for i in range(6)], free_times), "prompt")
+        large = choose_route(make_input([{"id": str(i)} for i in range(40)], free_times), "prompt")
+
+        self.assertEqual(empty["planner"], "local")
+        self.assertEqual(few["planner"], "local")
+        self.assertEqual(small["model"], "gpt-4o-mini")
+        self.assertEqual(large["model"], "gpt-4o")
+        self.assertGreaterEqual(large["max_tokens"], large["output_tokens"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from app.models import RescheduleResponse, normalize_schedule
+
+
+class TestNormalizeSchedule(unittest.TestCase):
+
+    def test_malformed_entries_dropped(self):
+        output = normalize_schedule({
+            "scheduled_tasks": [
+                {"task_id": 42, "start_time": "2024-01-02T09:00:00", "end_time": "2024-01-02T10:00:00"},
+                {"task_id": "b", "start_time": "2024-01-02T11:00:00"},
+                {"task_id": ["c"], "start_time": "2024-01-02T12:00:00", "end_time": "2024-01-02T13:00:00"},
+                {"task_id": "d", "start_time": "tomorrow", "end_time": "2024-01-02T13:00:00"},
+                "e",
+                {"task_id": "f", "start_time": "2024-01-02T14:00:00Z", "end_time": "2024-01-02T15:00:00Z",
+                 "note": "extra"},
+            ],
+            "reasoning": ["Packed the morning"],
+        })
+
+        self.assertEqual([entry["task_id"] for entry in output["scheduled_tasks"]], ["42", "f"])
+        self.assertEqual(output["reasoning"], "['Packed the morning']")
+        self.assertIsNone(output["today"])
+        # What is applied can always be returned
+        RescheduleResponse(message="ok", result=output)
+
+    def test_not_an_object(self):
+        self.assertEqual(normalize_schedule([1, 2])["scheduled_tasks"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
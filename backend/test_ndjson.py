@@ -0,0 +1,76 @@
+import asyncio
+import os
+import unittest
+from app.ndjson import LineTooLong, iter_ndjson_lines, parse_todo_line
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(*chunks, max_line_bytes=1024):
+    async def run():
+        return [line async for line in iter_ndjson_lines(stream(*chunks), max_line_bytes)]
+    return asyncio.run(run())
+
+
+class TestNdjsonLines(unittest.TestCase):
+
+    def test_lines_split_across_chunks(self):
+        # "é" is two bytes, split between chunks along with the lines
+        lines = collect(b'{"a": 1}\n{"b": "\xc3', b'\xa9"}\n\n{"c"', b': 3}')
+
+        self.assertEqual(lines, [(1, b'{"a": 1}'), (2, b'{"b": "\xc3\xa9"}'), (4, b'{"c": 3}')])
+
+    def test_trailing_newline(self):
+        self.assertEqual(collect(b'{"a": 1}\n'), [(1, b'{"a": 1}')])
+
+    def test_long_lines_are_errors(self):
+        lines = collect(b'{"a": 1}\n' + b"x" * 10, b"x" * 10, b'\n{"b": 2}\n' + b"y" * 30, max_line_bytes=16)
+
+        self.assertEqual([number for number, _ in lines], [1, 2, 3, 4])
+        self.assertEqual(lines[2], (3, b'{"b": 2}'))
+        for number in (1, 3):
+            self.assertIsInstance(lines[number][1], LineTooLong)
+        with self.assertRaises(ValueError):
+            parse_todo_line(lines[1][1])
+
+    def test_parse_errors_are_value_errors(self):
+        for raw_line in (b"\xff\xfe", b"[1, 2]", b"{not json", b'{"name": "Essay"}'):
+            with self.assertRaises(ValueError):
+                parse_todo_line(raw_line)
+
+        todo = parse_todo_line(b'{"name": "Essay", "dueDate": "2024-01-05", "priority": "High"}')
+        self.assertIsNone(todo.id)
+
+
+class TestBulkImport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+        import httpx
+        from benchmarks.fakes import install_fakes
+        cls.fakes = install_fakes()
+        cls.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=cls.fakes.app), base_url="http://test")
+
+    def test_bad_lines_reported_good_lines_written(self):
+        body = (
+            b'{"id": "bulk-a", "name": "Essay", "dueDate": "2024-01-05", "priority": "High"}\n'
+            b'{"name": "Bad \xff", "dueDate": "2024-01-05", "priority": "Low"}\n'
+            b'{"name": "No due date", "priority": "Low"}\n'
+            b'{"id": "bulk-b", "name": "Reading", "dueDate": "2024-01-06", "priority": "Low"}'
+        )
+
+        response = asyncio.run(self.client.post("/api/todos/bulk", content=body))
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual(result["created"], 2)
+        self.assertEqual([error["line"] for error in result["errors"]], [2, 3])
+        self.assertEqual(self.fakes.db.read("todos/bulk-b")["name"], "Reading")
+
+
+if __name__ == "__main__":
+    unittest.main()
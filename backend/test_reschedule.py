@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+
+class TestConcurrentReschedule(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+        from benchmarks.fakes import install_fakes, seed
+        cls.fakes = install_fakes()
+        cls.seed = staticmethod(seed)
+        import app.routes.todos as todos_module
+        from gcal_utils import TASK_CALENDAR_ID
+        cls.todos = todos_module
+        cls.task_calendar = TASK_CALENDAR_ID
+
+    def setUp(self):
+        # A fresh tree and calendar, so runs only see this test's todos
+        db, calendar = self.fakes.db, self.fakes.calendar
+        saved = db._documents, calendar.events_by_calendar
+        db._documents, calendar.events_by_calendar = {}, {"primary": {}}
+        self.addCleanup(self.restore, saved)
+        self.seed(db, calendar, todo_count=6, days=3)
+
+    def restore(self, saved):
+        self.fakes.db._documents, self.fakes.calendar.events_by_calendar = saved
+
+    def test_overlapping_runs_leave_one_event_per_todo(self):
+        plan = self.todos.call_gpt_for_scheduling
+
+        def slow_plan(gpt_input, recorder=None):
+            time.sleep(0.2)  # Long enough for both runs to be planning at once
+            return plan(gpt_input, recorder)
+
+        errors = []
+
+        def run():
+            try:
+                self.todos.schedule_tasks()
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(self.todos, "call_gpt_for_scheduling", slow_plan):
+            threads = [threading.Thread(target=run) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.todos.schedule_tasks()
+
+        self.assertEqual(errors, [])
+        events = self.fakes.calendar.events_by_calendar.get(self.task_calendar, {})
+        event_ids = {self.fakes.db.read(f"todos/todo{i:05d}").get("gcalEventId") for i in range(6)}
+        self.assertEqual(len(events), 6)
+        self.assertEqual(set(events), event_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
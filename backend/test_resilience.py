@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import patch
+from app.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    UpstreamUnavailable,
+    get_breaker,
+    resilient_call,
+    retry_after_of,
+)
+
+
+class FakeHttpError(Exception):
+    """
+    Shaped like googleapiclient's HttpError: status and headers on `resp`.
+    """
+
+    class Response(dict):
+        def __init__(self, status, headers=None):
+            super().__init__(headers or {})
+            self.status = status
+
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.resp = self.Response(status, headers)
+
+
+class TestResilientCall(unittest.TestCase):
+
+    def setUp(self):
+        sleep_patcher = patch("app.resilience.time.sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def test_retries_transient_errors(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FakeHttpError(503)
+            return "ok"
+
+        self.assertEqual(resilient_call("test-transient", flaky), "ok")
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(get_breaker("test-transient").stats()["retries"], 2)
+
+    def test_honours_retry_after(self):
+        attempts = []
+
+        def rate_limited():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise FakeHttpError(429, {"retry-after": "2"})
+            return "ok"
+
+        resilient_call("test-retry-after", rate_limited)
+        self.sleep.assert_called_once_with(2.0)
+
+    def test_client_errors_are_not_retried(self):
+        def not_found():
+            raise FakeHttpError(404)
+
+        with self.assertRaises(FakeHttpError):
+            resilient_call("test-404", not_found)
+        self.assertEqual(get_breaker("test-404").stats()["failures"], 0)
+
+    def test_deadline(self):
+        def rate_limited():
+            raise FakeHttpError(429, {"retry-after": "60"})
+
+        with self.assertRaises(UpstreamUnavailable):
+            resilient_call("test-deadline", rate_limited, deadline=5)
+        self.sleep.assert_not_called()
+
+    def test_non_idempotent_requests_not_repeated_after_timeouts(self):
+        attempts = []
+
+        def insert():
+            attempts.append(1)
+            raise TimeoutError("read timed out")
+
+        with self.assertRaises(UpstreamUnavailable):
+            resilient_call("test-insert-timeout", insert, idempotent=False)
+        self.assertEqual(len(attempts), 1)
+
+        # Rate limited requests weren't carried out, so they are retried
+        def rate_limited_once():
+            attempts.append(1)
+            if len(attempts) == 2:
+                raise FakeHttpError(429)
+            return "ok"
+
+        self.assertEqual(resilient_call("test-insert-429", rate_limited_once, idempotent=False), "ok")
+
+    def test_attempts_get_the_remaining_deadline(self):
+        timeouts = []
+
+        def slow(timeout):
+            timeouts.append(timeout)
+            if len(timeouts) == 1:
+                raise TimeoutError("read timed out")
+            return "ok"
+
+        with patch("app.resilience.time.monotonic", side_effect=[100.0, 100.0, 130.0, 160.0, 160.0]):
+            resilient_call("test-attempt-timeout", slow, deadline=90, pass_timeout=True)
+        self.assertEqual(timeouts, [90.0, 30.0])
+
+    def test_retry_after_parsing(self):
+        self.assertIsNone(retry_after_of(FakeHttpError(503)))
+        self.assertEqual(retry_after_of(FakeHttpError(503, {"retry-after": "1.5"})), 1.5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+        with patch("app.resilience.time.monotonic", return_value=100.0):
+            for _ in range(2):
+                self.assertTrue(breaker.allow())
+                breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+            self.assertFalse(breaker.allow())
+
+        with patch("app.resilience.time.monotonic", return_value=111.0):
+            self.assertTrue(breaker.allow())   # Half-open trial call
+            self.assertFalse(breaker.allow())  # Only one trial at a time
+            breaker.record_success()
+            self.assertEqual(breaker.state, "closed")
+
+    def test_open_circuit_fails_fast(self):
+        breaker = get_breaker("test-open")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        with self.assertRaises(CircuitOpenError):
+            resilient_call("test-open", lambda: "never called")
+
+
+if __name__ == "__main__":
+    unittest.main()
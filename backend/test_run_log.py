@@ -0,0 +1,45 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from app.run_log import RUN_LOG_VERSION, RunRecorder, load_run
+
+
+class TestRunLog(unittest.TestCase):
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = RunRecorder(directory)
+            with recorder.stage("prepare_input"):
+                recorder.record("todos", [{"id": "a", "created": datetime(2024, 1, 1)}])
+            recorder.append("chunks", {"start_date": "2024-01-02"})
+
+            run = load_run(recorder.save())
+
+        self.assertEqual(run["version"], RUN_LOG_VERSION)
+        # Values JSON can't hold (Firestore timestamps) are kept as strings
+        self.assertEqual(run["todos"][0]["created"], "2024-01-01 00:00:00")
+        self.assertEqual(run["chunks"], [{"start_date": "2024-01-02"}])
+        self.assertIn("prepare_input", run["timings"])
+
+    def test_disabled_recorder_writes_nothing(self):
+        recorder = RunRecorder()
+        with recorder.stage("apply"):
+            recorder.record("prompt", "...")
+        self.assertIsNone(recorder.save())
+        self.assertNotIn("prompt", recorder.run)
+        self.assertIn("apply", recorder.run["timings"])
+
+    def test_unknown_version_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.json.gz")
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump({"version": RUN_LOG_VERSION + 1}, f)
+            with self.assertRaises(ValueError):
+                load_run(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from app.shared_cache import MemoryCache, NullCache, SharedCache, SQLiteCache
+
+
+class FailingBackend:
+    name = "failing"
+
+    def get(self, key):
+        raise ConnectionError("cache server down")
+
+    def set(self, key, value, ttl):
+        raise ConnectionError("cache server down")
+
+    def incr(self, key):
+        raise ConnectionError("cache server down")
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sqlite_shared_between_instances(self):
+        # Two caches on one file stand in for two workers
+        first = SharedCache(SQLiteCache(self.path))
+        second = SharedCache(SQLiteCache(self.path))
+
+        first.set("profile", "user", {"name": "Ada"}, ttl=60)
+        self.assertEqual(second.get("profile", "user"), {"name": "Ada"})
+
+        second.invalidate("profile")
+        self.assertIsNone(first.get("profile", "user"))
+        # Other namespaces are untouched
+        first.set("busy_times", "range", [], ttl=60)
+        second.invalidate("profile")
+        self.assertEqual(second.get("busy_times", "range"), [])
+
+    def test_get_or_compute_and_expiry(self):
+        cache = SharedCache(MemoryCache())
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        self.assertEqual(cache.get_or_compute("schedule", "k", compute, ttl=0.05), {"value": 1})
+        self.assertEqual(cache.get_or_compute("schedule", "k", compute, ttl=0.05), {"value": 1})
+        time.sleep(0.06)
+        self.assertEqual(cache.get_or_compute("schedule", "k", compute, ttl=0.05), {"value": 2})
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_version_bump_misses(self):
+        backend = SQLiteCache(self.path)
+        SharedCache(backend).set("profile", "user", {"name": "Ada"}, ttl=60)
+        newer = SharedCache(backend, versions={"profile": 2})
+        self.assertIsNone(newer.get("profile", "user"))
+
+    def test_backend_errors_are_misses(self):
+        cache = SharedCache(FailingBackend())
+        self.assertEqual(cache.get_or_compute("profile", "user", lambda: {"name": "Ada"}), {"name": "Ada"})
+        cache.invalidate("profile")
+        self.assertGreater(cache.stats()["errors"], 0)
+
+    def test_disabled(self):
+        cache = SharedCache(NullCache())
+        cache.set("profile", "user", {"name": "Ada"})
+        self.assertIsNone(cache.get("profile", "user"))
+        self.assertFalse(cache.enabled)
+
+
+def make_gpt_input(run):
+    # Inputs of two runs over the same todos differ in the fields a run rewrites
+    return {
+        "tasks": [
+            {"id": f"t{i}", "name": f"Task {i}", "description": "", "priority": "medium",
+             "due_date": "2030-01-03 00:00:00", "estimated_time_hours": "1",
+             "scheduled_date": f"2030-01-0{run}", "gcal_event_id": f"event-{run}-{i}"}
+            for i in range(6)
+        ],
+        "free_times": [{"start": "2030-01-01 09:00:00", "end": "2030-01-01 17:00:00"}],
+        "busy_times": [],
+        "context": {"timezone": "America/New_York", "start_date": "2030-01-01", "end_date": "2030-01-03",
+                    "user_profile": {"name": "Ada", "about": "", "short_term_goals": "",
+                                     "medium_term_goals": "", "long_term_goals": ""}},
+    }
+
+
+class TestScheduleCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("OPENAI_API_KEY", "test")
+        from benchmarks.fakes import install_fakes
+        cls.fakes = install_fakes()
+        import app.routes.todos as todos_module
+        cls.todos = todos_module
+
+    def test_key_ignores_fields_a_run_rewrites(self):
+        route = {"model": "gpt-4o-mini", "max_tokens": 1000}
+        key = self.todos.schedule_cache_key(route, make_gpt_input(1))
+        self.assertEqual(self.todos.schedule_cache_key(route, make_gpt_input(2)), key)
+
+        changed = make_gpt_input(1)
+        changed["tasks"][0]["estimated_time_hours"] = "2"
+        self.assertNotEqual(self.todos.schedule_cache_key(route, changed), key)
+        self.assertNotEqual(self.todos.schedule_cache_key({**route, "model": "gpt-4o"}, make_gpt_input(1)), key)
+
+    def test_rerun_uses_cached_schedule(self):
+        cache = SharedCache(MemoryCache())
+        with patch.object(self.todos, "get_shared_cache", return_value=cache):
+            calls = self.fakes.openai.calls
+            first = self.todos.call_gpt_for_scheduling(make_gpt_input(1))
+            second = self.todos.call_gpt_for_scheduling(make_gpt_input(2))
+        self.assertEqual(self.fakes.openai.calls, calls + 1)
+        self.assertEqual(second, first)
+
+
+if __name__ == "__main__":
+    unittest.main()